@@ -0,0 +1,86 @@
+import logging
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.core.cache import LRUCache
+from backend.app.core.config import settings
+from backend.app.services.generation import get_latest_ingestion_run_async
+
+logger = logging.getLogger(__name__)
+
+ResponseCacheKey = Tuple[str, Tuple[Tuple[str, str], ...], int]  # (path, sorted query params, generation)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    media_type: Optional[str]
+    headers: Dict[str, str]
+
+
+# Responses only change with the ingestion generation, which is part of the key
+response_cache: LRUCache[ResponseCacheKey, CachedResponse] = LRUCache(maxsize=settings.response_cache_size)
+
+
+def make_etag(generation: int) -> str:
+    """
+    Strong entity tag of every offers response of an ingestion generation.
+    """
+    return f'"gen-{generation}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag`, using the weak comparison required for this header.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def validator_headers(generation: int, completed_at: datetime) -> Dict[str, str]:
+    return {
+        "ETag": make_etag(generation),
+        # Run times are stored as naive UTC
+        "Last-Modified": format_datetime(completed_at.replace(tzinfo=timezone.utc), usegmt=True),
+        # Clients may store responses but must revalidate them
+        "Cache-Control": "no-cache",
+    }
+
+
+async def cached_response(
+    request: Request, session: AsyncSession, render: Callable[[], Awaitable[Response]]
+) -> Response:
+    """
+    Serve an offers response tagged with the current ingestion generation:
+    304 Not Modified when the client already has it (If-None-Match), from the in-process cache when
+    it was rendered before for the same path and parameters, or rendered (and cached) otherwise.
+    Before the first ingestion run there is no generation, and responses are always rendered.
+    Streaming responses are tagged but never cached.
+    """
+    latest_run = await get_latest_ingestion_run_async(session)
+    if latest_run is None:
+        return await render()
+    generation, completed_at = latest_run
+    headers = validator_headers(generation, completed_at)
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        logger.debug(f"Not modified since generation {generation}: {request.url}")
+        return Response(status_code=304, headers=headers)
+
+    key: ResponseCacheKey = (request.url.path, tuple(sorted(request.query_params.multi_items())), generation)
+    cached = response_cache.get(key)
+    if cached is not None:
+        logger.debug(f"Response cache hit: {request.url}")
+        return Response(cached.body, media_type=cached.media_type, headers={**cached.headers, **headers})
+
+    response = await render()
+    response.headers.update(headers)
+    if response.status_code == 200 and hasattr(response, "body"):
+        extra_headers = {name: value for name, value in response.headers.items() if name.lower().startswith("x-")}
+        response_cache.set(key, CachedResponse(bytes(response.body), response.media_type, extra_headers))
+    return response
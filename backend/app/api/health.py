@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, status
 
 router = APIRouter()
 
@@ -9,5 +9,11 @@ def ping() -> dict[str, str]:
 
 
 @router.get("/health", include_in_schema=False)
-def health() -> dict[str, str]:
+def health(request: Request, response: Response) -> dict[str, str]:
+    """
+    Healthy once the startup warm-up is over (see backend.app.core.lifespan), 503 until then.
+    """
+    if not getattr(request.app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "starting"}
     return {"status": "ok"}
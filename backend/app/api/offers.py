@@ -1,47 +1,122 @@
 import logging
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Query
-from sqlmodel import Session
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from backend.app.db.session import get_session
-from backend.app.services.offer_service import OfferService
+from backend.app.api.caching import cached_response, response_cache
+from backend.app.core.config import settings
+from backend.app.db.session import get_async_engine, get_async_session
+from backend.app.services.async_offer_service import AsyncOfferService
+from backend.app.services.offer_service import search_cache
 from cardwise.domain.models.offer import Offer
+from cardwise.domain.models.offer_record import OfferRecord
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
-@router.get("/search")
-def search_offers(
+
+def encode_records(records: List[OfferRecord]) -> bytes:
+    """
+    Serialize offer records straight to JSON bytes, shaped like the `Offer` response model but without
+    building and validating one pydantic model per offer.
+    """
+    return orjson.dumps([record.to_json_dict() for record in records])
+
+
+def records_response(records: List[OfferRecord], headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(encode_records(records), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+@router.get("/search", response_model=List[Offer])
+async def search_offers(
+    request: Request,
     shops: List[str] = Query(..., description="Fuzzy search for shop names"),
-    session: Session = Depends(get_session),
-) -> List[Offer]:
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
     logger.info(f"🔍 Search request received with shop queries: {shops}")
-    service = OfferService(session)
-    offers = service.fuzzy_search(shops)
-    logger.info(f"🔎 Found {len(offers)} offers matching fuzzy search.")
-    return offers
 
+    async def render() -> Response:
+        records = await AsyncOfferService(session).fuzzy_search_records(shops)
+        logger.info(f"🔎 Found {len(records)} offers matching fuzzy search.")
+        return records_response(records)
 
-@router.get("/")
-def get_offers_paginated(
+    return await cached_response(request, session, render)
+
+
+@router.get("/", response_model=List[Offer])
+async def get_offers_paginated(
+    request: Request,
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    session: Session = Depends(get_session),
-) -> List[Offer]:
-    logger.info(f"📄 Paginated request received: limit={limit}, offset={offset}")
-    service = OfferService(session)
-    offers = service.list_offers_paginated(limit=limit, offset=offset)
-    logger.info(f"📦 Returned {len(offers)} offers (paginated)")
-    return offers
-
-
-@router.get("/all")
-def get_all_offers(session: Session = Depends(get_session)) -> List[Offer]:
-    logger.info("📥 Full offers list requested.")
-    service = OfferService(session)
-    offers = service.list_offers()
-    logger.info(f"📤 Returned {len(offers)} total offers.")
-    return offers
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} response header"),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    logger.info(f"📄 Paginated request received: limit={limit}, offset={offset}, cursor={cursor}")
+
+    async def render() -> Response:
+        try:
+            records, next_cursor = await AsyncOfferService(session).list_offer_records_page(
+                limit=limit, offset=offset, cursor=cursor
+            )
+        except ValueError as e:
+            logger.warning(f"❌ {e}")
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        logger.info(f"📦 Returned {len(records)} offers (paginated)")
+        return records_response(records, headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+    return await cached_response(request, session, render)
+
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Size and hit/miss counters of the in-process caches, to tune their sizes.
+    """
+    return {"search": search_cache.stats(), "responses": response_cache.stats()}
+
+
+@router.get("/all", response_model=List[Offer])
+async def get_all_offers(
+    request: Request,
+    stream: bool = Query(False, description="Stream offers as newline-delimited JSON"),
+    session: AsyncSession = Depends(get_async_session),
+) -> Response:
+    logger.info(f"📥 Full offers list requested (stream={stream}).")
+
+    async def render() -> Response:
+        # Always streamed with flat memory: the whole catalog is too large for the response cache
+        media_type = NDJSON_MEDIA_TYPE if stream else JSON_MEDIA_TYPE
+        return StreamingResponse(stream_offers(ndjson=stream), media_type=media_type)
+
+    return await cached_response(request, session, render)
+
+
+async def stream_offers(ndjson: bool = False) -> AsyncIterator[bytes]:
+    """
+    Yield all offers as JSON bytes, one chunk per DB batch: either the items of a single JSON array,
+    or one NDJSON line per offer.
+    Opens its own session: FastAPI closes `yield` dependencies before a streamed body is sent.
+    """
+    count = 0
+    async with AsyncSession(get_async_engine()) as session:
+        service = AsyncOfferService(session)
+        if not ndjson:
+            yield b"["
+        async for batch in service.iter_offer_record_batches(batch_size=settings.stream_batch_size):
+            if ndjson:
+                yield b"".join(orjson.dumps(record.to_json_dict()) + b"\n" for record in batch)
+            else:
+                # The batch as a JSON array, without its brackets
+                yield (b"," if count else b"") + encode_records(batch)[1:-1]
+            count += len(batch)
+        if not ndjson:
+            yield b"]"
+    logger.info(f"📤 Streamed {count} total offers.")
@@ -4,8 +4,21 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class BackendSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env.backend")
     database_url: str = ""
+    sqlite_tuning: bool = True  # WAL journal and the other pragmas of cardwise.persistence.sqlite
     debug: bool = False
     log_level: str = "INFO"
+    stream_batch_size: int = 1000  # Rows fetched per DB round-trip when streaming offers
+    fuzzy_workers: int = -1  # Threads used by rapidfuzz cdist, -1 for all cores
+    response_cache_size: int = 256  # Offer responses cached per ingestion generation, 0 to disable
+    search_cache_size: int = 4096  # Fuzzy matches cached per normalized query, 0 to disable
+    search_cache_ttl: float = 3600  # Seconds
+    db_pool_size: int = 5  # Connections kept open in the pool
+    db_max_overflow: int = 10  # Extra connections opened on bursts, closed once returned
+    db_pool_timeout: float = 30  # Seconds to wait for a free connection before failing
+    db_pool_recycle: int = 1800  # Seconds after which a connection is replaced, -1 to never recycle
+    db_pool_pre_ping: bool = True  # Check that a connection is alive before handing it out
+    db_warmup_connections: int = 2  # Connections opened at startup, capped by db_pool_size
+    startup_retry_interval: float = 5  # Seconds between two warm-up attempts while the database is unreachable
 
 
 settings = BackendSettings()
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Optional
+
+from fastapi import FastAPI
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.config import settings
+from backend.app.db.session import dispose_engines, get_async_engine, get_engine, warm_up_async_engine
+from backend.app.services.shop_index import get_shop_index_async
+from cardwise.persistence.migrations import run_migrations
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate() -> None:
+    """
+    Bring the database schema up to date before serving, as the offer endpoints read the columns added by
+    the migrations (e.g. offerdb.shop_key) and the backend may start before the next ingestion run.
+    """
+    await run_in_threadpool(run_migrations, get_engine())
+
+
+async def warm_up() -> None:
+    """
+    Create the engine, fill its pool with open connections and build the shop name index,
+    so that the first requests are served as fast as the following ones.
+    Raises if the database cannot be reached. The index is only preloaded on a best-effort basis: a missing
+    catalog (e.g. before the first ingestion) is logged and the index built on the first search.
+    """
+    opened = await warm_up_async_engine(settings.db_warmup_connections)
+    logger.info(f"Opened {opened} warm database connection(s).")
+    try:
+        async with AsyncSession(get_async_engine()) as session:
+            index = await get_shop_index_async(session)
+        logger.info(f"Preloaded the shop index: {len(index.keys)} shop(s) at generation {index.generation}.")
+    except Exception as e:
+        logger.warning(f"Could not preload the shop index, it will be built on the first search: {e}")
+
+
+async def prepare(app: FastAPI) -> bool:
+    """
+    Migrate and warm up, then flag the app ready. Returns False if the database could not be reached,
+    leaving /health at 503.
+    """
+    try:
+        await migrate()
+        await warm_up()
+    except Exception as e:
+        logger.error(f"❌ Startup warm-up failed, /health stays unavailable: {e!r}")
+        return False
+    app.state.ready = True
+    logger.info("✅ Cardwise API is ready.")
+    return True
+
+
+async def prepare_until_ready(app: FastAPI) -> None:
+    """
+    Retry `prepare` every `startup_retry_interval` seconds until the database is reachable.
+    """
+    while not await prepare(app):
+        await asyncio.sleep(settings.startup_retry_interval)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    FastAPI lifespan: warm up before serving, and report ready on /health only once done.
+    A database briefly unreachable at startup does not stop the process: the warm-up is retried in the
+    background, /health answering 503 meanwhile.
+    """
+    app.state.ready = False
+    retry: Optional[asyncio.Task[None]] = None
+    if not await prepare(app):
+        retry = asyncio.create_task(prepare_until_ready(app))
+    yield
+    if retry is not None:
+        retry.cancel()
+        with suppress(asyncio.CancelledError):
+            await retry
+    app.state.ready = False
+    await dispose_engines()
+    logger.info("👋 Cardwise API stopped.")
@@ -1,21 +1,114 @@
-from typing import Generator
+from contextlib import AsyncExitStack
+from typing import Any, AsyncGenerator, Dict, Generator
 
-from sqlalchemy.engine import Engine
+from sqlalchemy import text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.app.core.config import settings
+from cardwise.persistence.sqlite import apply_sqlite_pragmas
+
+# Async DBAPI driver used for each database backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
 
 _engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+
+
+def _is_sqlite_memory(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def get_pool_options(database_url: str) -> Dict[str, Any]:
+    """
+    Engine keyword arguments configuring the connection pool from the settings.
+    In-memory SQLite databases live in a single connection, so they only get the options of every pool.
+    """
+    options: Dict[str, Any] = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if not _is_sqlite_memory(make_url(database_url)):
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return options
 
 
 def get_engine() -> Engine:
     global _engine
     if _engine is None:
         connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-        _engine = create_engine(settings.database_url, echo=settings.debug, connect_args=connect_args)
+        _engine = create_engine(
+            settings.database_url,
+            echo=settings.debug,
+            connect_args=connect_args,
+            **get_pool_options(settings.database_url),
+        )
+        if settings.sqlite_tuning:
+            apply_sqlite_pragmas(_engine)
     return _engine
 
 
+def get_async_database_url(database_url: str) -> str:
+    """
+    Swap the driver of a database URL for its async counterpart,
+    e.g. postgresql+psycopg2://... -> postgresql+asyncpg://...
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver for the '{backend}' database backend, expected one of {list(ASYNC_DRIVERS)}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(settings.database_url),
+            echo=settings.debug,
+            **get_pool_options(settings.database_url),
+        )
+        if settings.sqlite_tuning:
+            apply_sqlite_pragmas(_async_engine.sync_engine)
+    return _async_engine
+
+
+async def warm_up_async_engine(connections: int) -> int:
+    """
+    Open up to `connections` connections of the async engine at once, capped by the pool size,
+    and hand them back to the pool so that the first requests do not pay for the connection setup.
+    Returns the number of connections opened.
+    """
+    engine = get_async_engine()
+    if _is_sqlite_memory(engine.url):
+        connections = min(connections, 1)
+    connections = min(connections, settings.db_pool_size)
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            connection = await stack.enter_async_context(engine.connect())
+            await connection.execute(text("SELECT 1"))
+    return connections
+
+
+async def dispose_engines() -> None:
+    """
+    Close the pooled connections of both engines, which are recreated on their next use.
+    """
+    global _engine, _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
 def get_session() -> Generator[Session, None, None]:
     """
     Yields a SQLModel session, intended for use with FastAPI Depends().
@@ -23,3 +116,11 @@ def get_session() -> Generator[Session, None, None]:
     engine = get_engine()
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yields an async SQLModel session, intended for use with FastAPI Depends() in `async def` endpoints.
+    """
+    async with AsyncSession(get_async_engine()) as session:
+        yield session
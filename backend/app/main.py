@@ -6,6 +6,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.app.api import health, offers
+from backend.app.core.lifespan import lifespan
 from backend.app.core.logging_config import setup_logging
 
 setup_logging()
@@ -24,6 +25,7 @@ app = FastAPI(
     title="Cardwise API",
     description="API for accessing parsed card offers",
     version=get_project_version(),
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -32,9 +34,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[offers.NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
 
 app.include_router(offers.router, prefix="/offers", tags=["Offers"])
 app.include_router(health.router)
-
-logger.info("✅ Cardwise API is ready.")
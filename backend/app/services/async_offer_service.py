@@ -0,0 +1,70 @@
+import logging
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.services.offer_service import (
+    all_records_statement,
+    encode_cursor,
+    match_queries,
+    normalize_queries,
+    page_statement,
+    records_by_ids_statements,
+)
+from backend.app.services.shop_index import get_shop_index_async
+from cardwise.domain.models.offer_record import OfferRecord
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOfferService:
+    """
+    Async variant of the OfferService record queries, for `async def` endpoints.
+    Requests wait on the database without holding a threadpool slot; only the CPU-bound fuzzy
+    matching runs in a worker thread.
+    """
+
+    def __init__(self, session: AsyncSession, threshold: int = 75):
+        self.session = session
+        self.threshold = threshold
+
+    async def list_offer_records(self) -> List[OfferRecord]:
+        logger.debug("Fetching all offers from DB.")
+        return list(map(OfferRecord._make, await self.session.exec(all_records_statement())))
+
+    async def iter_offer_record_batches(self, batch_size: int = 1000) -> AsyncIterator[List[OfferRecord]]:
+        """
+        Yield all offers in batches, fetched from the DB `batch_size` rows at a time (server-side cursor).
+        """
+        logger.debug(f"Streaming all offers from DB in batches of {batch_size}.")
+        result = await self.session.stream(all_records_statement().execution_options(yield_per=batch_size))
+        async for batch in result.partitions():
+            yield list(map(OfferRecord._make, batch))
+
+    async def list_offer_records_page(
+        self, limit: int = 20, offset: int = 0, cursor: Optional[str] = None
+    ) -> Tuple[List[OfferRecord], Optional[str]]:
+        """
+        Return a page of offers ordered by id, and the cursor of the next page (None on the last page).
+        See `OfferService.list_offer_records_page`.
+        """
+        logger.debug(f"Fetching offers with limit={limit}, offset={offset} and cursor={cursor}")
+        records = list(map(OfferRecord._make, await self.session.exec(page_statement(limit, offset, cursor))))
+        next_cursor = encode_cursor(records[-1].id) if len(records) == limit else None
+        return records, next_cursor
+
+    async def fuzzy_search_records(self, shop_queries: List[str]) -> List[OfferRecord]:
+        logger.debug(f"Performing fuzzy search with queries: {shop_queries}")
+        queries = normalize_queries(shop_queries)
+        if not queries:
+            return []
+        index = await get_shop_index_async(self.session)
+        matched_keys = await run_in_threadpool(match_queries, index, queries, self.threshold)
+        logger.debug(f"Matches for {queries}: {sorted(matched_keys)}")
+
+        records: List[OfferRecord] = []
+        for stmt in records_by_ids_statements(index.offer_ids_for(matched_keys)):
+            records.extend(map(OfferRecord._make, await self.session.exec(stmt)))
+        logger.debug(f"Fuzzy search yielded {len(records)} matching offers.")
+        return records
@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
+
+logger = logging.getLogger(__name__)
+
+CURRENT_GENERATION = select(func.max(IngestionRunDB.id))
+LATEST_INGESTION_RUN = (
+    select(IngestionRunDB.id, IngestionRunDB.completed_at).order_by(col(IngestionRunDB.id).desc()).limit(1)
+)
+
+
+def get_current_generation(session: Session) -> Optional[int]:
+    """
+    Return the id of the latest ingestion run, or None if no run has been recorded yet.
+    """
+    try:
+        return session.exec(CURRENT_GENERATION).one()
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not read the ingestion generation: {e}")
+        session.rollback()
+        return None
+
+
+async def get_current_generation_async(session: AsyncSession) -> Optional[int]:
+    """
+    Async variant of `get_current_generation`.
+    """
+    try:
+        return (await session.exec(CURRENT_GENERATION)).one()
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not read the ingestion generation: {e}")
+        await session.rollback()
+        return None
+
+
+def get_latest_ingestion_run(session: Session) -> Optional[Tuple[int, datetime]]:
+    """
+    Return the (generation, completion time) of the latest ingestion run, or None if no run has been recorded yet.
+    """
+    try:
+        row = session.exec(LATEST_INGESTION_RUN).first()
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not read the latest ingestion run: {e}")
+        session.rollback()
+        return None
+    return (row[0], row[1]) if row else None
+
+
+async def get_latest_ingestion_run_async(session: AsyncSession) -> Optional[Tuple[int, datetime]]:
+    """
+    Async variant of `get_latest_ingestion_run`.
+    """
+    try:
+        row = (await session.exec(LATEST_INGESTION_RUN)).first()
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not read the latest ingestion run: {e}")
+        await session.rollback()
+        return None
+    return (row[0], row[1]) if row else None
@@ -1,53 +1,202 @@
+import base64
+import binascii
 import logging
-from typing import List, Set
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 from rapidfuzz import fuzz, process
-from sqlmodel import Session, select
+from sqlmodel import Session, col, select
+from sqlmodel.sql.expression import Select
 
+from backend.app.core.cache import LRUCache
+from backend.app.core.config import settings
+from backend.app.services.shop_index import ShopNameIndex, get_shop_index
 from cardwise.domain.models.offer import Offer
+from cardwise.domain.models.offer_record import OfferRecord
+from cardwise.domain.utils import normalize_string
 from cardwise.persistence.models.offer_db import OfferDB
 
 logger = logging.getLogger(__name__)
 
+# Keep IN (...) lists under SQLite's bound parameter limit
+ID_BATCH_SIZE = 500
+# Selected in the order of the OfferRecord fields
+OFFER_RECORD_COLUMNS = tuple(getattr(OfferDB, field) for field in OfferRecord._fields)
+
+
+def encode_cursor(offer_id: str) -> str:
+    """
+    Encode the id of the last offer of a page into an opaque pagination cursor.
+    """
+    return base64.urlsafe_b64encode(offer_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Decode a pagination cursor back into an offer id. Raises ValueError on malformed cursors.
+    """
+    try:
+        return base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+def match_shop_names_by_query(
+    queries: List[str], shop_names: List[str], threshold: float, workers: int = 1
+) -> Dict[str, FrozenSet[str]]:
+    """
+    Return the shop names scoring at least `threshold` against each query.
+    All queries are scored in a single vectorized `cdist` call, using `workers` threads (-1 for all cores).
+    """
+    if not queries:
+        return {}
+    if not shop_names:
+        return {query: frozenset() for query in queries}
+    scores = process.cdist(queries, shop_names, scorer=fuzz.ratio, score_cutoff=threshold, workers=workers)
+    return {
+        query: frozenset(shop_names[i] for i in np.flatnonzero(row >= threshold)) for query, row in zip(queries, scores)
+    }
+
+
+# Matched shop names of a normalized query, by (generation, threshold, query): a new ingestion
+# generation changes the key, invalidating the previous results
+SearchCacheKey = Tuple[Optional[int], float, str]
+search_cache: LRUCache[SearchCacheKey, FrozenSet[str]] = LRUCache(
+    maxsize=settings.search_cache_size, ttl=settings.search_cache_ttl
+)
+
+
+def normalize_queries(shop_queries: List[str]) -> List[str]:
+    """
+    Normalize shop queries like the indexed shop names, dropping duplicates and queries left empty.
+    """
+    if not shop_queries:
+        logger.warning("Fuzzy search received empty query list.")
+        return []
+    queries = list(dict.fromkeys(key for key in map(normalize_string, shop_queries) if key))
+    if not queries:
+        logger.warning(f"Fuzzy search queries are empty once normalized: {shop_queries}")
+    return queries
+
+
+def match_queries(index: ShopNameIndex, queries: List[str], threshold: float) -> Set[str]:
+    """
+    Return the shop names of the index matched by any of the normalized queries, reusing the cached
+    matches of the queries already searched in this generation.
+    """
+    matched_keys: Set[str] = set()
+    missing: List[str] = []
+    for query in queries:
+        cached = search_cache.get((index.generation, threshold, query))
+        if cached is None:
+            missing.append(query)
+        else:
+            matched_keys.update(cached)
+    if not missing:
+        return matched_keys
+
+    candidates = index.candidates_for(missing, threshold)
+    logger.debug(f"Candidate shop names after n-gram prefilter: {len(candidates)}/{len(index.keys)}")
+    matches = match_shop_names_by_query(missing, candidates, threshold, workers=settings.fuzzy_workers)
+    for query, query_matches in matches.items():
+        search_cache.set((index.generation, threshold, query), query_matches)
+        matched_keys.update(query_matches)
+    return matched_keys
+
+
+def all_records_statement() -> Select[Any]:
+    return select(*OFFER_RECORD_COLUMNS)
+
+
+def page_statement(limit: int, offset: int, cursor: Optional[str]) -> Select[Any]:
+    """
+    Page of offers ordered by id, starting right after the offer of the cursor if any.
+    Raises ValueError on malformed cursors.
+    """
+    stmt = select(*OFFER_RECORD_COLUMNS).order_by(col(OfferDB.id)).offset(offset).limit(limit)
+    if cursor is not None:
+        stmt = stmt.where(col(OfferDB.id) > decode_cursor(cursor))
+    return stmt
+
+
+def records_by_ids_statements(offer_ids: List[str]) -> Iterator[Select[Any]]:
+    for start in range(0, len(offer_ids), ID_BATCH_SIZE):
+        yield select(*OFFER_RECORD_COLUMNS).where(col(OfferDB.id).in_(offer_ids[start : start + ID_BATCH_SIZE]))
+
 
 class OfferService:
+    """
+    Offers read service. The `*_records` methods return lightweight OfferRecord tuples read straight from
+    the offer columns, for the bulk paths; the other methods return validated domain Offers.
+    """
+
     def __init__(self, session: Session, threshold: int = 75):
         self.session = session
         self.threshold = threshold
 
     def list_offers(self) -> List[Offer]:
+        return [record.to_offer() for record in self.list_offer_records()]
+
+    def list_offer_records(self) -> List[OfferRecord]:
         logger.debug("Fetching all offers from DB.")
-        offers = self.session.exec(select(OfferDB)).all()
-        return [o.to_domain() for o in offers]
+        return list(map(OfferRecord._make, self.session.exec(all_records_statement())))
+
+    def iter_offer_batches(self, batch_size: int = 1000) -> Iterator[List[Offer]]:
+        for batch in self.iter_offer_record_batches(batch_size):
+            yield [record.to_offer() for record in batch]
+
+    def iter_offer_record_batches(self, batch_size: int = 1000) -> Iterator[List[OfferRecord]]:
+        """
+        Yield all offers in batches, fetched from the DB `batch_size` rows at a time (server-side cursor),
+        so memory stays flat regardless of the catalog size.
+        """
+        logger.debug(f"Streaming all offers from DB in batches of {batch_size}.")
+        stmt = all_records_statement().execution_options(yield_per=batch_size)
+        for batch in self.session.exec(stmt).partitions():
+            yield list(map(OfferRecord._make, batch))
 
     def list_offers_paginated(self, limit: int = 20, offset: int = 0) -> List[Offer]:
-        logger.debug(f"Fetching offers with limit={limit} and offset={offset}")
-        stmt = select(OfferDB).offset(offset).limit(limit)
-        offers = self.session.exec(stmt).all()
-        return [o.to_domain() for o in offers]
+        offers, _ = self.list_offers_page(limit=limit, offset=offset)
+        return offers
+
+    def list_offers_page(
+        self, limit: int = 20, offset: int = 0, cursor: Optional[str] = None
+    ) -> Tuple[List[Offer], Optional[str]]:
+        records, next_cursor = self.list_offer_records_page(limit=limit, offset=offset, cursor=cursor)
+        return [record.to_offer() for record in records], next_cursor
+
+    def list_offer_records_page(
+        self, limit: int = 20, offset: int = 0, cursor: Optional[str] = None
+    ) -> Tuple[List[OfferRecord], Optional[str]]:
+        """
+        Return a page of offers ordered by id, and the cursor of the next page (None on the last page).
+        With a cursor, the page starts right after the last offer of the previous page (keyset pagination),
+        so deep pages cost the same as the first one. `offset` is applied after the cursor.
+        """
+        logger.debug(f"Fetching offers with limit={limit}, offset={offset} and cursor={cursor}")
+        records = list(map(OfferRecord._make, self.session.exec(page_statement(limit, offset, cursor))))
+        next_cursor = encode_cursor(records[-1].id) if len(records) == limit else None
+        return records, next_cursor
 
     def fuzzy_search(self, shop_queries: List[str]) -> List[Offer]:
+        return [record.to_offer() for record in self.fuzzy_search_records(shop_queries)]
+
+    def fuzzy_search_records(self, shop_queries: List[str]) -> List[OfferRecord]:
         logger.debug(f"Performing fuzzy search with queries: {shop_queries}")
-        if not shop_queries:
-            logger.warning("Fuzzy search received empty query list.")
+        queries = normalize_queries(shop_queries)
+        if not queries:
             return []
-        logger.debug("Fetching all offers from DB for fuzzy search.")
-        db_offers = self.session.exec(select(OfferDB)).all()
-        logger.debug(f"Total offers retrieved from DB: {len(db_offers)}")
-        all_shop_names = {offer.shop_name for offer in db_offers}
-        logger.debug(f"Unique shop names filtered: {len(all_shop_names)}")
-        matched_names: Set[str] = set()
-        for query in shop_queries:
-            matches = process.extract(
-                query.lower(),
-                all_shop_names,
-                scorer=fuzz.ratio,
-                limit=None,
-                score_cutoff=self.threshold,
-            )
-            logger.debug(f"Matches for '{query}': {[m[0] for m in matches]}")
-            matched_names.update(match[0] for match in matches)
-
-        filtered = [offer for offer in db_offers if offer.shop_name in matched_names]
-        logger.debug(f"Fuzzy search yielded {len(filtered)} matching offers.")
-        return [offer.to_domain() for offer in filtered]
+        index = get_shop_index(self.session)
+        matched_keys = match_queries(index, queries, self.threshold)
+        logger.debug(f"Matches for {queries}: {sorted(matched_keys)}")
+
+        offer_ids = index.offer_ids_for(matched_keys)
+        records = self._get_records_by_ids(offer_ids)
+        logger.debug(f"Fuzzy search yielded {len(records)} matching offers.")
+        return records
+
+    def _get_records_by_ids(self, offer_ids: List[str]) -> List[OfferRecord]:
+        records: List[OfferRecord] = []
+        for stmt in records_by_ids_statements(offer_ids):
+            records.extend(map(OfferRecord._make, self.session.exec(stmt)))
+        return records
@@ -0,0 +1,161 @@
+import logging
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.services.generation import get_current_generation, get_current_generation_async
+from cardwise.persistence.models.offer_db import OfferDB
+
+logger = logging.getLogger(__name__)
+
+# Bigrams rather than trigrams: at the default fuzzy threshold (75) the trigram bound below is
+# almost always <= 0 and would prune nothing, while the bigram bound stays positive.
+NGRAM_SIZE = 2
+NGRAM_PAD = " "  # Never present in normalized keys
+
+SHOP_KEY_ROWS = select(OfferDB.id, OfferDB.shop_key)
+
+
+def ngrams(key: str) -> Counter[str]:
+    """
+    Multiset of padded n-grams of a normalized key.
+    """
+    padded = NGRAM_PAD * (NGRAM_SIZE - 1) + key + NGRAM_PAD * (NGRAM_SIZE - 1)
+    return Counter(padded[i : i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1))
+
+
+def min_shared_ngrams(len_a: int, len_b: int, threshold: float) -> Optional[int]:
+    """
+    Lower bound on the padded n-grams shared by two strings whose `fuzz.ratio` is at least `threshold`.
+    Returns None when no pair of strings of these lengths can reach the threshold.
+
+    `fuzz.ratio` is 200 * LCS / (len_a + len_b), so a match needs an LCS of at least `lcs`. Turning a
+    into b then deletes len_a - lcs characters (each breaking at most q n-grams) and inserts
+    len_b - lcs characters (each breaking at most q - 1 n-grams); the remaining n-grams are shared.
+    """
+    lcs = math.ceil(threshold * (len_a + len_b) / 200 - 1e-9)
+    if lcs > min(len_a, len_b):
+        return None
+    q = NGRAM_SIZE
+    return (2 * q - 1) * lcs - (q - 1) * (len_a + len_b) + q - 1
+
+
+class ShopNameIndex:
+    """
+    In-memory index of normalized shop names for a single ingestion generation.
+    Maps each normalized name to its offer ids, and each n-gram to the names containing it.
+    """
+
+    def __init__(self, generation: Optional[int], offer_ids_by_key: Dict[str, List[str]]):
+        self.generation = generation
+        self.offer_ids_by_key = offer_ids_by_key
+        self.keys = list(offer_ids_by_key)
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.key_ids_by_length: Dict[int, List[int]] = defaultdict(list)
+        for key_id, key in enumerate(self.keys):
+            self.key_ids_by_length[len(key)].append(key_id)
+            for gram, count in ngrams(key).items():
+                self.postings[gram].append((key_id, count))
+
+    @classmethod
+    def build(cls, session: Session, generation: Optional[int]) -> "ShopNameIndex":
+        """
+        Build the index from the (id, shop_key) columns only, without hydrating offers.
+        """
+        logger.debug(f"Building shop name index for generation {generation}...")
+        return cls.from_rows(generation, session.exec(SHOP_KEY_ROWS).all())
+
+    @classmethod
+    def from_rows(cls, generation: Optional[int], rows: Sequence[Tuple[str, str]]) -> "ShopNameIndex":
+        """
+        Build the index from (offer id, shop key) rows.
+        """
+        offer_ids_by_key: Dict[str, List[str]] = defaultdict(list)
+        for offer_id, shop_key in rows:
+            offer_ids_by_key[shop_key].append(offer_id)
+        logger.info(f"Shop name index built: {len(offer_ids_by_key)} shops, {len(rows)} offers.")
+        return cls(generation, dict(offer_ids_by_key))
+
+    def candidates(self, query_key: str, threshold: float) -> List[str]:
+        """
+        Return the normalized names that may score at least `threshold` against `query_key`.
+        The filter is lossless: every name that would match is kept.
+        """
+        need_by_length = {
+            length: min_shared_ngrams(len(query_key), length, threshold) for length in self.key_ids_by_length
+        }
+
+        candidate_ids: List[int] = []
+        for length, need in need_by_length.items():
+            if need is not None and need <= 0:
+                candidate_ids.extend(self.key_ids_by_length[length])
+
+        shared: Dict[int, int] = defaultdict(int)
+        for gram, count in ngrams(query_key).items():
+            for key_id, key_count in self.postings.get(gram, ()):
+                shared[key_id] += min(count, key_count)
+        for key_id, count in shared.items():
+            need = need_by_length[len(self.keys[key_id])]
+            if need is not None and 0 < need <= count:
+                candidate_ids.append(key_id)
+
+        return [self.keys[key_id] for key_id in candidate_ids]
+
+    def candidates_for(self, query_keys: Iterable[str], threshold: float) -> List[str]:
+        """
+        Union of the candidates of several queries.
+        """
+        union: Set[str] = set()
+        for query_key in query_keys:
+            union.update(self.candidates(query_key, threshold))
+        return sorted(union)
+
+    def offer_ids_for(self, keys: Iterable[str]) -> List[str]:
+        return [offer_id for key in keys for offer_id in self.offer_ids_by_key.get(key, [])]
+
+
+_index: Optional[ShopNameIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_shop_index(session: Session) -> ShopNameIndex:
+    """
+    Return the process-wide shop name index, rebuilding it when the ingestion generation changes.
+    """
+    global _index
+    generation = get_current_generation(session)
+    with _index_lock:
+        if _index is None or _index.generation != generation:
+            _index = ShopNameIndex.build(session, generation)
+        return _index
+
+
+async def get_shop_index_async(session: AsyncSession) -> ShopNameIndex:
+    """
+    Async variant of `get_shop_index`. The index is built in a worker thread, off the event loop.
+    Concurrent requests may each rebuild a stale index, the last one built is kept.
+    """
+    global _index
+    generation = await get_current_generation_async(session)
+    index = _index
+    if index is not None and index.generation == generation:
+        return index
+    rows = (await session.exec(SHOP_KEY_ROWS)).all()
+    index = await run_in_threadpool(ShopNameIndex.from_rows, generation, rows)
+    with _index_lock:
+        _index = index
+    return index
+
+
+def reset_shop_index() -> None:
+    """
+    Drop the process-wide index so that the next search rebuilds it.
+    """
+    global _index
+    with _index_lock:
+        _index = None
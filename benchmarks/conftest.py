@@ -0,0 +1,54 @@
+import random
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+
+from cardwise.domain.models.bank import Bank
+from cardwise.domain.models.offer import Offer, OfferTypeEnum
+from cardwise.domain.models.shop import Shop
+
+BANKS = [Bank(name="Chase"), Bank(name="Capital One"), Bank(name="Bank of America")]
+
+WORDS = [
+    "shake", "shack", "star", "bucks", "adi", "das", "whole", "foods", "target", "wal", "mart", "best", "buy",
+    "home", "depot", "blue", "apron", "door", "dash", "uber", "eats", "lyft", "spot", "ify", "net", "flix",
+    "chip", "otle", "sweet", "green", "pan", "era", "bread", "coffee", "bean", "tea", "leaf", "sun", "moon",
+]  # fmt: skip
+
+
+def make_shop_names(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate `count` distinct, realistic-looking shop names.
+    """
+    rng = random.Random(seed)
+    names: set[str] = set()
+    while len(names) < count:
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        names.add(
+            " ".join(word.capitalize() for word in words) + (f" {rng.randint(1, 99)}" if rng.random() < 0.5 else "")
+        )
+    return sorted(names)
+
+
+def make_offers(count: int, seed: int = 0) -> List[Offer]:
+    """
+    Generate `count` distinct offers spread over a realistic number of shops.
+    """
+    rng = random.Random(seed)
+    shops = [Shop(name=name) for name in make_shop_names(max(count // 20, 10), seed)]
+    return [
+        Offer(
+            shop=rng.choice(shops),
+            bank=rng.choice(BANKS),
+            offer_type=rng.choice(list(OfferTypeEnum)),
+            description=f"{rng.randint(1, 30)}% back, offer #{i}",
+            expiry_date=datetime(2030, 1, 1) + timedelta(days=rng.randint(0, 365)) if rng.random() < 0.5 else None,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(scope="session")
+def shop_names() -> List[str]:
+    return make_shop_names(5_000)
@@ -0,0 +1,40 @@
+import random
+from typing import List, Set
+
+import pytest
+from rapidfuzz import fuzz, process
+
+from backend.app.services.offer_service import match_shop_names_by_query
+
+THRESHOLD = 75
+
+
+def match_shop_names_per_query(queries: List[str], shop_names: List[str], threshold: float) -> Set[str]:
+    """
+    Previous implementation: one `process.extract` call per query.
+    """
+    matched: Set[str] = set()
+    for query in queries:
+        matches = process.extract(query, shop_names, scorer=fuzz.ratio, limit=None, score_cutoff=threshold)
+        matched.update(match[0] for match in matches)
+    return matched
+
+
+def make_queries(shop_names: List[str], count: int) -> List[str]:
+    rng = random.Random(count)
+    return [rng.choice(shop_names).lower() for _ in range(count)]
+
+
+@pytest.mark.parametrize("n_queries", [10, 100, 1000])
+def test_bench_per_query_extract(benchmark, shop_names: List[str], n_queries: int):  # type: ignore
+    benchmark.group = f"fuzzy-search-{n_queries}-queries"
+    queries = make_queries(shop_names, n_queries)
+    benchmark(match_shop_names_per_query, queries, shop_names, THRESHOLD)
+
+
+@pytest.mark.parametrize("n_queries", [10, 100, 1000])
+def test_bench_batched_cdist(benchmark, shop_names: List[str], n_queries: int):  # type: ignore
+    benchmark.group = f"fuzzy-search-{n_queries}-queries"
+    queries = make_queries(shop_names, n_queries)
+    result = benchmark(match_shop_names_by_query, queries, shop_names, THRESHOLD, -1)
+    assert set().union(*result.values()) == match_shop_names_per_query(queries, shop_names, THRESHOLD)
@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from benchmarks.conftest import make_offers
+from cardwise.domain.models.offer import Offer
+from cardwise.persistence.models.offer_db import OfferDB
+from ingestion.persistence.repository import OfferRepository
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+@pytest.fixture(scope="module")
+def offers_by_size() -> Dict[int, List[Offer]]:
+    return {size: make_offers(size) for size in SIZES}
+
+
+def fresh_repository(bulk: bool) -> Tuple[Tuple[OfferRepository], Dict[str, Any]]:
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    return (OfferRepository(Session(engine), bulk=bulk),), {}
+
+
+@pytest.mark.parametrize("bulk", [False, True], ids=["orm", "bulk"])
+@pytest.mark.parametrize("size", SIZES)
+def test_bench_insert_many(benchmark, offers_by_size: Dict[int, List[Offer]], size: int, bulk: bool):  # type: ignore
+    benchmark.group = f"insert-{size}-offers"
+    offers = offers_by_size[size]
+    repositories: List[OfferRepository] = []
+
+    def insert(repository: OfferRepository) -> None:
+        repositories.append(repository)
+        repository.insert_many(offers)
+
+    benchmark.pedantic(insert, setup=lambda: fresh_repository(bulk), rounds=3)
+    assert repositories[-1].session.exec(select(func.count()).select_from(OfferDB)).one() == size
@@ -0,0 +1,71 @@
+from typing import Dict, Iterator, List
+
+import pytest
+from sqlalchemy import Engine, text
+from sqlmodel import Session, col, create_engine, select
+
+from benchmarks.conftest import make_offers
+from cardwise.domain.models.offer import Offer
+from cardwise.persistence.migrations import run_migrations
+from cardwise.persistence.models.offer_db import OfferDB
+from ingestion.persistence.repository import OfferRepository
+
+SIZE = 200_000
+
+
+@pytest.fixture(scope="module")
+def offers() -> List[Offer]:
+    return make_offers(SIZE)
+
+
+@pytest.fixture(scope="module")
+def engines(offers: List[Offer]) -> Iterator[Dict[bool, Engine]]:
+    """
+    The same catalog with the migrated schema, and without its secondary indexes (the previous schema).
+    """
+    engines: Dict[bool, Engine] = {}
+    for indexed in (True, False):
+        engine = create_engine("sqlite:///:memory:")
+        run_migrations(engine)
+        with Session(engine) as session:
+            OfferRepository(session).insert_many(offers)
+            session.exec(text("ANALYZE"))  # type: ignore # As done by OfferRepository.sync()
+            if not indexed:
+                for index in OfferDB.__table__.indexes:  # type: ignore
+                    session.exec(text(f"DROP INDEX {index.name}"))  # type: ignore
+                session.commit()
+        engines[indexed] = engine
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+@pytest.mark.parametrize("indexed", [False, True], ids=["scan", "index"])
+def test_bench_lookup_by_shop(benchmark, engines: Dict[bool, Engine], offers: List[Offer], indexed: bool):  # type: ignore
+    benchmark.group = f"lookup-by-shop-{SIZE}-rows"
+    shop_keys = [offer.shop.id for offer in offers[:50]]
+    with Session(engines[indexed]) as session:
+
+        def lookup() -> int:
+            return sum(len(session.exec(select(OfferDB.id).where(OfferDB.shop_key == key)).all()) for key in shop_keys)
+
+        assert benchmark(lookup) >= len(shop_keys)
+
+
+@pytest.mark.parametrize("indexed", [False, True], ids=["scan", "index"])
+def test_bench_lookup_by_bank_and_expiry(benchmark, engines: Dict[bool, Engine], offers: List[Offer], indexed: bool):  # type: ignore
+    benchmark.group = f"lookup-by-bank-{SIZE}-rows"
+    expiry_dates = sorted(offer.expiry_date for offer in offers if offer.expiry_date)[:: SIZE // 100][:10]
+    with Session(engines[indexed]) as session:
+
+        def lookup() -> int:
+            return sum(
+                len(
+                    session.exec(
+                        select(OfferDB.id).where(OfferDB.bank_name == "Chase", col(OfferDB.expiry_date) == expiry_date)
+                    ).all()
+                )
+                for expiry_date in expiry_dates
+            )
+
+        assert benchmark(lookup) > 0
@@ -0,0 +1,45 @@
+import random
+from typing import List
+
+import pytest
+
+from cardwise.domain.utils import normalize_string
+
+
+def normalize_string_per_char(s: str) -> str:
+    """
+    Previous implementation: a per-character list comprehension.
+    """
+    s_ = "".join([c.lower() for c in s if c.isalnum() or c == " "])
+    return s_.strip().replace(" ", "_")
+
+
+@pytest.fixture(name="names", scope="module")
+def names_fixture(shop_names: List[str]) -> List[str]:
+    """
+    50k lookups over 2k names, some with accents: shop names repeat heavily across banks and offers.
+    """
+    rng = random.Random(0)
+    pool = shop_names[:1_800] + [f"Café {name} Crème" for name in shop_names[1_800:2_000]]
+    return [rng.choice(pool) for _ in range(50_000)]
+
+
+def normalize_all(normalize, names: List[str]) -> List[str]:  # type: ignore
+    return [normalize(name) for name in names]
+
+
+def test_bench_normalize_per_char(benchmark, names: List[str]):  # type: ignore
+    benchmark.group = "normalize-string"
+    benchmark(normalize_all, normalize_string_per_char, names)
+
+
+def test_bench_normalize_translate(benchmark, names: List[str]):  # type: ignore
+    benchmark.group = "normalize-string"
+    result = benchmark(normalize_all, normalize_string.__wrapped__, names)
+    assert result == normalize_all(normalize_string_per_char, names)
+
+
+def test_bench_normalize_translate_cached(benchmark, names: List[str]):  # type: ignore
+    benchmark.group = "normalize-string"
+    result = benchmark(normalize_all, normalize_string, names)
+    assert result == normalize_all(normalize_string_per_char, names)
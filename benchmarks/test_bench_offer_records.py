@@ -0,0 +1,59 @@
+import json
+from typing import Any, Iterator, List
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from backend.app.api.offers import encode_records
+from backend.app.services.offer_service import OfferService
+from benchmarks.conftest import make_offers
+from cardwise.domain.models.offer import Offer
+from cardwise.persistence.models.offer_db import OfferDB
+from ingestion.persistence.repository import OfferRepository
+
+SIZE = 20_000
+
+
+@pytest.fixture(name="session", scope="module")
+def session_fixture() -> Iterator[Session]:
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        OfferRepository(session).insert_many(make_offers(SIZE))
+        yield session
+
+
+def list_response_via_domain(session: Session) -> str:
+    """
+    Previous implementation: hydrate ORM objects, convert them to validated Offers, then serialize.
+    """
+    offers: List[Offer] = [offer.to_domain() for offer in session.exec(select(OfferDB)).all()]
+    return json.dumps([offer.model_dump(mode="json") for offer in offers])
+
+
+def list_response_via_records(session: Session) -> str:
+    records = OfferService(session).list_offer_records()
+    return json.dumps([record.to_json_dict() for record in records])
+
+
+def list_response_via_records_orjson(session: Session) -> bytes:
+    return encode_records(OfferService(session).list_offer_records())
+
+
+def test_bench_list_response_domain(benchmark, session: Session):  # type: ignore
+    benchmark.group = f"list-{SIZE}-offers-response"
+    benchmark(list_response_via_domain, session)
+
+
+def test_bench_list_response_records(benchmark, session: Session):  # type: ignore
+    benchmark.group = f"list-{SIZE}-offers-response"
+    result: Any = benchmark(list_response_via_records, session)
+    assert sorted(json.loads(result), key=lambda o: o["id"]) == sorted(
+        json.loads(list_response_via_domain(session)), key=lambda o: o["id"]
+    )
+
+
+def test_bench_list_response_records_orjson(benchmark, session: Session):  # type: ignore
+    benchmark.group = f"list-{SIZE}-offers-response"
+    result: Any = benchmark(list_response_via_records_orjson, session)
+    assert json.loads(result) == json.loads(list_response_via_records(session))
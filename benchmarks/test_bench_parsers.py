@@ -0,0 +1,70 @@
+from typing import Callable, Dict, List, Tuple, Type
+
+import pytest
+
+from benchmarks.conftest import make_shop_names
+from ingestion.parsers.bank_of_america import BankOfAmericaOfferParser
+from ingestion.parsers.base import PARSER_BACKENDS, BankOfferParser
+from ingestion.parsers.capital_one import CapitalOneOfferParser
+from ingestion.parsers.chase import ChaseOfferParser
+
+N_OFFERS = 1_000
+# Saved bank pages are mostly navigation, scripts and layout markup around the offer tiles
+FILLER = (
+    '<nav class="menu"><ul>'
+    + "".join(f'<li><a href="/p{i}" class="link">Item {i}</a></li>' for i in range(20))
+    + "</ul></nav>"
+    '<script type="text/javascript">window.__STATE__ = {"tracking": "'
+    + "x" * 2_000
+    + '"};</script>'
+    + '<div class="layout"><div class="row"><div class="col"><p>Lorem ipsum dolor sit amet</p></div></div></div>' * 10
+)
+
+
+def chase_tile(shop: str, description: str) -> str:
+    return f'<div class="r9jbije r9jbijl"><span>{shop}</span><span>{description}</span></div>'
+
+
+def bank_of_america_tile(shop: str, description: str) -> str:
+    return (
+        f'<div class="deal-logo-wrapper top"><img alt="{shop} Logo">'
+        f'<span class="deal-offer-percent">{description}</span></div>'
+    )
+
+
+def capital_one_tile(shop: str, description: str) -> str:
+    return (
+        '<div class="standard-tile relative flex flex-col justify-between w-full h-full mt-0">'
+        f'<img src="https://images.example.com/logo?domain={shop.lower().replace(" ", "")}.com">'
+        f"<div>{shop}</div><div>{description}</div></div>"
+    )
+
+
+PARSERS: Dict[str, Tuple[Type[BankOfferParser], Callable[[str, str], str]]] = {
+    "chase": (ChaseOfferParser, chase_tile),
+    "bank_of_america": (BankOfAmericaOfferParser, bank_of_america_tile),
+    "capital_one": (CapitalOneOfferParser, capital_one_tile),
+}
+
+
+def make_page(tile: Callable[[str, str], str], shop_names: List[str]) -> str:
+    body = "".join(FILLER + tile(shop, f"{i % 30 + 1}% cash back") for i, shop in enumerate(shop_names))
+    return f"<html><head><title>Offers</title></head><body>{body}</body></html>"
+
+
+@pytest.fixture(scope="module")
+def pages() -> Dict[str, str]:
+    shop_names = make_shop_names(N_OFFERS)
+    return {bank_id: make_page(tile, shop_names) for bank_id, (_, tile) in PARSERS.items()}
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("bank_id", list(PARSERS))
+def test_bench_parse_page(benchmark, pages: Dict[str, str], bank_id: str, backend: str):  # type: ignore
+    parser_cls, _ = PARSERS[bank_id]
+    parser = parser_cls()
+    parser.backend = backend
+    benchmark.group = f"parse-{bank_id}-{len(pages[bank_id]) // 1_000_000}MB"
+
+    offers = benchmark.pedantic(parser.parse, args=(pages[bank_id],), rounds=3)
+    assert len(offers) == N_OFFERS
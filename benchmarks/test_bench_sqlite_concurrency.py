@@ -0,0 +1,80 @@
+import itertools
+import multiprocessing
+import time
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+from sqlalchemy import Engine
+from sqlmodel import Session, col, create_engine, func, select
+
+from benchmarks.conftest import make_offers
+from cardwise.domain.models.offer import Offer
+from cardwise.persistence.migrations import run_migrations
+from cardwise.persistence.models.offer_db import OfferDB
+from cardwise.persistence.sqlite import apply_sqlite_pragmas
+from ingestion.persistence.repository import OfferRepository
+
+SIZE = 100_000
+READS = 500
+READ_INTERVAL = 0.01  # Seconds between two reads
+
+
+@pytest.fixture(scope="module")
+def catalogs() -> List[List[Offer]]:
+    """
+    Two catalogs of the same size with no offer in common: each ingest replaces the whole table.
+    """
+    offers = make_offers(2 * SIZE)
+    return [offers[:SIZE], offers[SIZE:]]
+
+
+def make_engine(path: Path, tuned: bool) -> Engine:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if tuned:
+        apply_sqlite_pragmas(engine)
+    run_migrations(engine)
+    return engine
+
+
+def ingest_forever(path: Path, tuned: bool, catalogs: List[List[Offer]], stop: Any) -> None:
+    """
+    Keep syncing the catalogs in turn, each one replacing the whole table, until `stop` is set.
+    """
+    engine = make_engine(path, tuned)
+    for turn in itertools.count():
+        if stop.is_set():
+            break
+        with Session(engine) as session:
+            OfferRepository(session).sync(catalogs[turn % 2])
+    engine.dispose()
+
+
+@pytest.mark.parametrize("tuned", [False, True], ids=["rollback-journal", "wal"])
+def test_bench_read_during_ingest(benchmark, tmp_path: Path, catalogs: List[List[Offer]], tuned: bool):  # type: ignore
+    """
+    Time a shop lookup while another process keeps ingesting. With the default rollback journal, a read
+    waits whenever the writer holds the exclusive lock (commits, page cache spills): see the Max column.
+    """
+    benchmark.group = f"read-during-ingest-{SIZE}-offers"
+    path = tmp_path / "offers.db"
+    engine = make_engine(path, tuned)
+    with Session(engine) as session:
+        OfferRepository(session).sync(catalogs[1])
+    shop_keys = itertools.cycle(sorted({offer.shop.id for offer in catalogs[0] + catalogs[1]}))
+    context = multiprocessing.get_context("fork")  # The catalogs are inherited rather than pickled
+    stop = context.Event()
+    writer = context.Process(target=ingest_forever, args=(path, tuned, catalogs, stop))
+    writer.start()
+    time.sleep(1)  # Let the writer load the catalogs and start syncing
+
+    def read(session: Session) -> None:
+        session.exec(select(func.count()).where(col(OfferDB.shop_key) == next(shop_keys))).one()
+        session.rollback()  # End the read transaction, as a request would
+
+    with Session(engine) as session:
+        # Spread the reads over several syncs
+        benchmark.pedantic(read, args=(session,), setup=lambda: time.sleep(READ_INTERVAL), rounds=READS)
+    stop.set()
+    writer.join()
+    engine.dispose()
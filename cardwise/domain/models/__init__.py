@@ -1,5 +1,6 @@
 from .bank import Bank
 from .offer import Offer, OfferTypeEnum
+from .offer_record import OfferRecord
 from .shop import Shop
 
-__all__ = ["Offer", "OfferTypeEnum", "Bank", "Shop"]
+__all__ = ["Offer", "OfferRecord", "OfferTypeEnum", "Bank", "Shop"]
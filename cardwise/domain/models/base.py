@@ -0,0 +1,21 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+from typing_extensions import Self
+
+
+class DomainModel(BaseModel):
+    """
+    Immutable base of the domain models.
+    Being frozen, their computed fields can be cached with `functools.cached_property`.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            # The cached values live in the instance __dict__ and would be copied over stale
+            for name in type(self).model_computed_fields:
+                copied.__dict__.pop(name, None)
+        return copied
@@ -1,11 +1,13 @@
 import logging
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Optional
 
-from pydantic import BaseModel, computed_field
+from pydantic import computed_field
 
 from cardwise.domain.models.bank import Bank
+from cardwise.domain.models.base import DomainModel
 from cardwise.domain.models.shop import Shop
 
 logger = logging.getLogger(__name__)
@@ -17,7 +19,7 @@ class OfferTypeEnum(str, Enum):
     MISC = "misc"
 
 
-class Offer(BaseModel):
+class Offer(DomainModel):
     shop: Shop
     bank: Bank
     offer_type: OfferTypeEnum
@@ -25,10 +27,10 @@ class Offer(BaseModel):
     expiry_date: Optional[datetime] = None
 
     @computed_field
-    @property
+    @cached_property
     def id(self) -> str:
         """
-        Deterministic identifier for this offer.
+        Deterministic identifier for this offer, computed once.
         """
         return f"{self.shop.id}|{self.bank.id}|{self.offer_type}|{self.description}"
 
@@ -46,4 +48,4 @@ class Offer(BaseModel):
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Offer):
             return NotImplemented
-        return self.id == other.id
+        return self is other or self.id == other.id
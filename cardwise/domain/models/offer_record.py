@@ -0,0 +1,51 @@
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+import cardwise.domain.utils as utils
+from cardwise.domain.models.bank import Bank
+from cardwise.domain.models.offer import Offer, OfferTypeEnum
+from cardwise.domain.models.shop import Shop
+
+
+class OfferRecord(NamedTuple):
+    """
+    Flat, tuple-backed representation of an offer, mirroring the columns of an offers row.
+    Used on the bulk paths (DB reads and writes, API responses): it is built without validation,
+    which only happens at the boundaries, when converting from and to a domain Offer.
+    """
+
+    id: str
+    shop_name: str
+    bank_name: str
+    offer_type: OfferTypeEnum
+    description: str
+    expiry_date: Optional[datetime] = None
+
+    @classmethod
+    def from_offer(cls, offer: Offer) -> "OfferRecord":
+        return cls(offer.id, offer.shop.name, offer.bank.name, offer.offer_type, offer.description, offer.expiry_date)
+
+    def to_offer(self) -> Offer:
+        """
+        Convert to a validated domain Offer.
+        """
+        return Offer(
+            shop=Shop.intern(self.shop_name),
+            bank=Bank.intern(self.bank_name),
+            offer_type=self.offer_type,
+            description=self.description,
+            expiry_date=self.expiry_date,
+        )
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        """
+        JSON-ready dict shaped like `Offer.model_dump(mode="json")`.
+        """
+        return {
+            "shop": {"name": self.shop_name, "id": utils.normalize_string(self.shop_name)},
+            "bank": {"name": self.bank_name, "id": utils.normalize_string(self.bank_name)},
+            "offer_type": self.offer_type.value,
+            "description": self.description,
+            "expiry_date": self.expiry_date.isoformat() if self.expiry_date else None,
+            "id": self.id,
+        }
@@ -1,27 +1,43 @@
 import logging
+from functools import cached_property, lru_cache
 
-from pydantic import BaseModel, computed_field
+from pydantic import computed_field
 
 import cardwise.domain.utils as utils
+from cardwise.domain.models.base import DomainModel
 
 logger = logging.getLogger(__name__)
 
+INTERN_CACHE_SIZE = 65536
 
-class Shop(BaseModel):
+
+class Shop(DomainModel):
     name: str  # Canonical name
 
     @computed_field
-    @property
+    @cached_property
     def id(self) -> str:
         """
-        Deterministic unique ID for the shop.
+        Deterministic unique ID for the shop, computed once.
         """
         return utils.normalize_string(self.name)
 
+    @classmethod
+    def intern(cls, name: str) -> "Shop":
+        """
+        Return the shared Shop instance of this name, so that the offers of a shop reuse its cached id.
+        """
+        return _interned_shop(name)
+
     def __hash__(self) -> int:
         return hash(self.id)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Shop):
             return NotImplemented
-        return self.id == other.id
+        return self is other or self.id == other.id
+
+
+@lru_cache(maxsize=INTERN_CACHE_SIZE)
+def _interned_shop(name: str) -> Shop:
+    return Shop(name=name)
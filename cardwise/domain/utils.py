@@ -1,8 +1,29 @@
+import re
+import string
+from functools import lru_cache
+
+NORMALIZE_CACHE_SIZE = 65536
+
+# ASCII fast path: lowercase letters, keep digits and spaces, delete everything else
+_ASCII_TABLE = str.maketrans(
+    string.ascii_uppercase,
+    string.ascii_lowercase,
+    "".join(c for c in map(chr, range(128)) if not (c.isalnum() or c == " ")),
+)
+# \w is str.isalnum() plus the underscore
+_NON_ALNUM_RE = re.compile(r"[^\w ]|_")
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_string(s: str) -> str:
     """
     Normalize a string by removing leading and trailing whitespace and converting to lowercase.
+    Only alphanumeric characters are kept, and inner spaces become underscores.
     """
-    s_ = "".join([c.lower() for c in s if c.isalnum() or c == " "])
+    if s.isascii():
+        s_ = s.translate(_ASCII_TABLE)
+    else:
+        # Lowercase character by character: str.lower() is context dependent (e.g. final sigma)
+        s_ = "".join(map(str.lower, _NON_ALNUM_RE.sub("", s)))
     # remove spaces
-    s_ = s_.strip().replace(" ", "_")
-    return s_
+    return s_.strip().replace(" ", "_")
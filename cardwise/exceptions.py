@@ -1,7 +1,9 @@
 class CardwiseError(Exception):
     """Base exception for all Cardwise errors."""
 
-    pass
+    def __reduce__(self):
+        # Rebuild from the constructor arguments so that errors can cross process boundaries
+        return (self.__class__, getattr(self, "init_args", self.args))
 
 
 class OfferParsingError(CardwiseError):
@@ -9,6 +11,7 @@ class OfferParsingError(CardwiseError):
 
     def __init__(self, bank: str, message: str):
         super().__init__(f"[{bank}] Offer parsing failed: {message}")
+        self.init_args = (bank, message)
 
 
 class OfferShopNameParsingError(OfferParsingError):
@@ -16,6 +19,7 @@ class OfferShopNameParsingError(OfferParsingError):
 
     def __init__(self, bank: str, detail: str):
         super().__init__(bank, f"Offer's shop name not found. {detail}")
+        self.init_args = (bank, detail)
 
 
 class OfferDescriptionParsingError(OfferParsingError):
@@ -23,6 +27,7 @@ class OfferDescriptionParsingError(OfferParsingError):
 
     def __init__(self, bank: str, detail: str):
         super().__init__(bank, f"Offer's description not found. {detail}")
+        self.init_args = (bank, detail)
 
 
 class OfferSourceNotFound(CardwiseError):
@@ -30,3 +35,4 @@ class OfferSourceNotFound(CardwiseError):
 
     def __init__(self, bank: str, path: str):
         super().__init__(f"[{bank}] HTML file not found: {path}")
+        self.init_args = (bank, path)
@@ -0,0 +1,85 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, List
+
+from sqlalchemy import bindparam, inspect, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel, func, select
+
+from cardwise.domain.utils import normalize_string
+from cardwise.persistence.models.offer_db import OfferDB
+from cardwise.persistence.models.schema_version_db import SchemaVersionDB
+
+logger = logging.getLogger(__name__)
+
+OFFER_TABLE = OfferDB.__table__  # type: ignore
+SCHEMA_VERSION_TABLE = SchemaVersionDB.__table__  # type: ignore
+BACKFILL_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A schema change applied once to existing databases.
+    Fresh databases are created with the current schema by `create_all`, so upgrades must be idempotent.
+    """
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def _index_offers(connection: Connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns(OFFER_TABLE.name)}
+    if "shop_key" not in columns:
+        connection.execute(text(f"ALTER TABLE {OFFER_TABLE.name} ADD COLUMN shop_key VARCHAR NOT NULL DEFAULT ''"))
+
+    rows = connection.execute(
+        select(OFFER_TABLE.c.id, OFFER_TABLE.c.shop_name).where(OFFER_TABLE.c.shop_key == "")
+    ).all()
+    backfill = update(OFFER_TABLE).where(OFFER_TABLE.c.id == bindparam("_id")).values(shop_key=bindparam("shop_key"))
+    for start in range(0, len(rows), BACKFILL_BATCH_SIZE):
+        batch = rows[start : start + BACKFILL_BATCH_SIZE]
+        connection.execute(
+            backfill, [{"_id": offer_id, "shop_key": normalize_string(name)} for offer_id, name in batch]
+        )
+    logger.info(f"Backfilled the shop key of {len(rows)} offer(s).")
+
+    for index in OFFER_TABLE.indexes:
+        index.create(connection, checkfirst=True)
+    # Fresh planner statistics, e.g. for SQLite to prefer the selective expiry_date index over bank_name
+    connection.execute(text(f"ANALYZE {OFFER_TABLE.name}"))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Index offers by shop_name, bank_name and expiry_date, add the indexed shop_key", _index_offers),
+]
+
+
+def get_schema_version(connection: Connection) -> int:
+    """
+    Return the version of the last applied migration, 0 if none was applied.
+    """
+    return connection.execute(select(func.coalesce(func.max(SCHEMA_VERSION_TABLE.c.version), 0))).scalar_one()
+
+
+def run_migrations(engine: Engine, migrations: List[Migration] = MIGRATIONS) -> int:
+    """
+    Create the missing tables, then apply the pending migrations in order, each in its own transaction.
+    Returns the resulting schema version.
+    """
+    SQLModel.metadata.create_all(engine)  # Only creates missing tables, existing ones are left as they are
+    with engine.connect() as connection:
+        version = get_schema_version(connection)
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version <= version:
+            continue
+        logger.info(f"Applying schema migration {migration.version}: {migration.description}...")
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                SCHEMA_VERSION_TABLE.insert().values(version=migration.version, description=migration.description)
+            )
+        version = migration.version
+    logger.info(f"Database schema is at version {version}.")
+    return version
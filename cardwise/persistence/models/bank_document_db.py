@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class BankDocumentDB(SQLModel, table=True):
+    """
+    DB record of the last successfully ingested HTML document of a bank.
+    Its content hash lets the ingestion skip documents that did not change since.
+    """
+
+    bank_id: str = Field(primary_key=True)
+    content_hash: str
+    ingested_at: datetime = Field(default_factory=datetime.now)
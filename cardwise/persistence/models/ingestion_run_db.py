@@ -0,0 +1,15 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class IngestionRunDB(SQLModel, table=True):
+    """
+    DB record of a completed ingestion run.
+    Its autoincremented id is the data generation served by the backend.
+    """
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    completed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc).replace(tzinfo=None))  # UTC
+    offer_count: int = 0
@@ -1,11 +1,10 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from sqlmodel import Field, SQLModel
 
-from cardwise.domain.models.bank import Bank
 from cardwise.domain.models.offer import Offer, OfferTypeEnum
-from cardwise.domain.models.shop import Shop
+from cardwise.domain.models.offer_record import OfferRecord
 
 
 class OfferDB(SQLModel, table=True):
@@ -14,34 +13,35 @@ class OfferDB(SQLModel, table=True):
     """
 
     id: str = Field(primary_key=True)
-    shop_name: str
-    bank_name: str
+    shop_name: str = Field(index=True)
+    bank_name: str = Field(index=True)
     offer_type: OfferTypeEnum
     description: str
-    expiry_date: Optional[datetime] = None
+    expiry_date: Optional[datetime] = Field(default=None, index=True)
+    shop_key: str = Field(default="", index=True)  # Normalized shop name, i.e. the shop id
 
     @classmethod
     def from_domain(cls, offer: Offer) -> "OfferDB":
         """
         Convert a domain Offer to a DB OfferDB.
         """
-        return cls(
-            id=offer.id,
-            shop_name=offer.shop.name,
-            bank_name=offer.bank.name,
-            offer_type=offer.offer_type,
-            description=offer.description,
-            expiry_date=offer.expiry_date,
-        )
+        return cls(**cls.row_from_domain(offer))
+
+    @classmethod
+    def row_from_domain(cls, offer: Offer) -> Dict[str, Any]:
+        """
+        Convert a domain Offer to a plain column -> value row, for bulk inserts.
+        """
+        return {**OfferRecord.from_offer(offer)._asdict(), "shop_key": offer.shop.id}
+
+    def to_record(self) -> OfferRecord:
+        """
+        Convert a DB object to a lightweight OfferRecord.
+        """
+        return OfferRecord(self.id, self.shop_name, self.bank_name, self.offer_type, self.description, self.expiry_date)
 
     def to_domain(self) -> Offer:
         """
         Convert a DB object to the domain model.
         """
-        return Offer(
-            shop=Shop(name=self.shop_name),
-            bank=Bank(name=self.bank_name),
-            offer_type=self.offer_type,
-            description=self.description,
-            expiry_date=self.expiry_date,
-        )
+        return self.to_record().to_offer()
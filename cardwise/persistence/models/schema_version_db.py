@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class SchemaVersionDB(SQLModel, table=True):
+    """
+    DB record of an applied schema migration.
+    """
+
+    version: int = Field(primary_key=True)
+    description: str
+    applied_at: datetime = Field(default_factory=datetime.now)
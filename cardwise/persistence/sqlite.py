@@ -0,0 +1,35 @@
+import logging
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Performance profile of a SQLite database shared by the ingestion (single writer) and the API (readers)
+SQLITE_PRAGMAS: Dict[str, Any] = {
+    "journal_mode": "WAL",  # Readers keep reading the last committed snapshot while a write is in progress
+    "synchronous": "NORMAL",  # Safe with WAL: fsync at checkpoints only, a crash may lose the last commits
+    "mmap_size": 256 * 1024 * 1024,  # Bytes of the database file read through memory mapping
+    "cache_size": -64 * 1024,  # Page cache per connection, negative values are in KiB
+    "busy_timeout": 5000,  # Milliseconds to wait for a lock before failing with "database is locked"
+}
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Optional[Mapping[str, Any]] = None) -> None:
+    """
+    Run the `pragmas` (SQLITE_PRAGMAS by default) on every new connection of a SQLite engine.
+    Other databases are left untouched. For an AsyncEngine, pass its `sync_engine`.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    statements = [f"PRAGMA {name}={value}" for name, value in (SQLITE_PRAGMAS if pragmas is None else pragmas).items()]
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+    logger.debug(f"SQLite connections of {engine.url} will run: {statements}")
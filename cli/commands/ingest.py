@@ -10,11 +10,13 @@ def register(app: typer.Typer):
     @app.command()
     def ingest(  # type: ignore
         upload: bool = typer.Option(False, "--upload", help="Upload local HTML files to GCS before ingestion"),
+        force: bool = typer.Option(False, "--force", help="Re-parse HTML files even if they did not change"),
     ):
         """Ingest all HTML offers and populate the database.
         If --upload is specified, it will upload local HTML files to the GCS bucket before ingestion.
-        The HTML files should be located in the 'ingestion/data/' folder."""
-        ingestion.main.main(upload=upload)
+        The HTML files should be located in the 'ingestion/data/' folder.
+        HTML files unchanged since the last ingestion are skipped, unless --force is specified."""
+        ingestion.main.main(upload=upload, force=force)
 
     @app.command(name="upload")
     def upload_command():  # type: ignore
@@ -6,9 +6,20 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class BackendSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env.ingestion")
     database_url: str = ""
+    sqlite_tuning: bool = True  # WAL journal and the other pragmas of cardwise.persistence.sqlite
     log_level: str = "INFO"
     gcs_credentials: Path = Path("ingestion/gcs/ingestion-bot-key.json")
     gcs_bucket_name: str = "cardwise-html-private"
+    download_concurrency: int = 8  # Parallel HTML downloads
+    download_max_retries: int = 3
+    download_retry_backoff: float = 0.5  # Seconds, doubled after each retry
+    html_parser: str = "lxml"  # "html.parser", "lxml" or "selectolax"
+    stream_parsing: bool = False  # Parse the HTML files incrementally from byte streams (bounded memory)
+    stream_chunk_size: int = 1 << 20  # Bytes read at a time when stream parsing
+    parse_workers: int = 0  # Parser processes, 0 for one per CPU core, 1 to parse in-process
+    pipeline_queue_size: int = 2  # Documents buffered between two pipeline stages (download, parse, write)
+    bulk_insert: bool = True  # COPY / executemany instead of one ORM object per offer
+    insert_chunk_size: int = 5000
 
 
 settings = BackendSettings()
@@ -1,5 +1,5 @@
 import logging
-from typing import List
+from typing import BinaryIO, Dict, List
 
 from google.cloud import storage
 from google.oauth2 import service_account
@@ -25,12 +25,33 @@ class GCSClient:
         )
         return html_files
 
+    def list_html_hashes(self, prefix: str = "data/bank_htmls/") -> Dict[str, str]:
+        """
+        Map each HTML file to the MD5 of its content, read from the object metadata without downloading it.
+        """
+        blobs = self.client.list_blobs(self.bucket, prefix=prefix)  # type: ignore
+        html_hashes: Dict[str, str] = {
+            blob.name: blob.md5_hash or f"generation:{blob.generation}"  # type: ignore
+            for blob in blobs  # type: ignore
+            if blob.name.endswith(".html")  # type: ignore
+        }
+        logger.info(f"Found {len(html_hashes)} HTML files in GCS bucket {self.bucket.name} under '{prefix}'")  # type: ignore
+        return html_hashes
+
     def download_file_content(self, file_path: str) -> str:
         blob = self.bucket.blob(file_path)  # type: ignore
         logger.debug(f"Downloading HTML file content: {file_path}")
         html_doc: str = blob.download_as_text()  # type: ignore
         return html_doc
 
+    def open_file(self, file_path: str) -> BinaryIO:
+        """
+        Open the blob as a byte stream, fetched chunk by chunk instead of downloaded at once.
+        """
+        blob = self.bucket.blob(file_path)  # type: ignore
+        logger.debug(f"Streaming HTML file content: {file_path}")
+        return blob.open("rb")  # type: ignore
+
     def upload_file(self, file_path: str) -> None:
         filename = file_path.split("/")[-1]
         blob = self.bucket.blob(f"data/bank_htmls/{filename}")  # type: ignore
@@ -0,0 +1,54 @@
+import hashlib
+import logging
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class HTMLStorage(Protocol):
+    """
+    Storage backend holding the bank HTML files, implemented by GCSClient and LocalHTMLStorage.
+    """
+
+    def list_html_files(self, prefix: str = "data/bank_htmls/") -> List[str]: ...
+
+    def list_html_hashes(self, prefix: str = "data/bank_htmls/") -> Dict[str, str]: ...
+
+    def download_file_content(self, file_path: str) -> str: ...
+
+    def open_file(self, file_path: str) -> BinaryIO: ...
+
+
+class LocalHTMLStorage:
+    """
+    HTMLStorage reading files from a local folder laid out like the GCS bucket.
+    Useful for local runs and tests.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def list_html_files(self, prefix: str = "data/bank_htmls/") -> List[str]:
+        html_files = sorted(
+            path.relative_to(self.root).as_posix() for path in (self.root / prefix).glob("*.html") if path.is_file()
+        )
+        logger.info(f"Found {len(html_files)} HTML files in {self.root} under '{prefix}': {html_files}")
+        return html_files
+
+    def list_html_hashes(self, prefix: str = "data/bank_htmls/") -> Dict[str, str]:
+        """
+        Map each HTML file to the MD5 of its content, like the GCS object metadata.
+        """
+        return {
+            file_path: hashlib.md5((self.root / file_path).read_bytes(), usedforsecurity=False).hexdigest()
+            for file_path in self.list_html_files(prefix)
+        }
+
+    def download_file_content(self, file_path: str) -> str:
+        logger.debug(f"Reading HTML file content: {file_path}")
+        return (self.root / file_path).read_text(encoding="utf-8")
+
+    def open_file(self, file_path: str) -> BinaryIO:
+        logger.debug(f"Opening HTML file as a byte stream: {file_path}")
+        return (self.root / file_path).open("rb")
@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
 
+from ingestion.core.config import settings
 from ingestion.core.logging_config import setup_logging
 from ingestion.persistence.db import get_session, init_db
 from ingestion.persistence.repository import OfferRepository
@@ -11,14 +12,15 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
-def main(upload: bool = False):
+def main(upload: bool = False, force: bool = False):
     """
     Main function to handle the ingestion process.
     If `upload` is True, it will upload local HTML files to GCS before ingestion.
+    If `force` is True, unchanged HTML files are parsed again too.
     """
     if upload:
         main_upload_htmls()
-    main_ingest()
+    main_ingest(force=force)
 
 
 def main_upload_htmls():
@@ -31,18 +33,19 @@ def main_upload_htmls():
     logger.info("✅ Upload completed.")
 
 
-def main_ingest():
+def main_ingest(force: bool = False):
     """
-    Ingest all HTML offers and populate the database.
+    Ingest the HTML offers that changed since the last run (all of them with `force`) and populate the database.
     """
     logger.info("📥 Ingesting HTML offers...")
     init_db()
 
     with get_session() as session:
-        repo = OfferRepository(session)
+        repo = OfferRepository(session, bulk=settings.bulk_insert, chunk_size=settings.insert_chunk_size)
         pipeline = OfferIngestionPipeline(
             html_folder=Path("ingestion/data/"),
             repository=repo,
+            force=force,
         )
         pipeline.run()
     logger.info("✅ Ingestion completed. Exiting")
@@ -1,21 +1,93 @@
 import importlib
-import inspect
-import os
-import pkgutil
-from typing import List
+import logging
+from functools import lru_cache
+from importlib.metadata import EntryPoint, entry_points
+from typing import Dict, List, Optional, Type, Union
 
-from ingestion.parsers import base as parsers_pkg
 from ingestion.parsers.base import BankOfferParser
 
+logger = logging.getLogger(__name__)
 
-def discover_parsers() -> list[BankOfferParser]:
-    parsers: List[BankOfferParser] = []
-    package = "ingestion.parsers"
-    parser_path = os.path.dirname(parsers_pkg.__file__)
-    for _, module_name, _ in pkgutil.iter_modules([parser_path]):
-        if module_name != "base":
-            module = importlib.import_module(f"{package}.{module_name}")
-            for _, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, BankOfferParser) and obj is not BankOfferParser:
-                    parsers.append(obj())
-    return parsers
+# Installed packages can ship parsers with an entry point of this group, named after the bank id:
+# [project.entry-points."cardwise.parsers"]
+# my_bank = "my_package.parsers:MyBankOfferParser"
+ENTRY_POINT_GROUP = "cardwise.parsers"
+
+# Parsers shipped with cardwise, by bank id, as "module:Class" paths so that they are only imported when needed
+BUILTIN_PARSERS: Dict[str, str] = {
+    "bank_of_america": "ingestion.parsers.bank_of_america:BankOfAmericaOfferParser",
+    "capital_one": "ingestion.parsers.capital_one:CapitalOneOfferParser",
+    "chase": "ingestion.parsers.chase:ChaseOfferParser",
+}
+
+ParserSource = Union[str, Type[BankOfferParser], EntryPoint]  # A "module:Class" path, a class or an entry point
+
+# Explicit registrations, taking precedence over the entry points, which take precedence over the built-in parsers
+_registered: Dict[str, ParserSource] = {}
+
+
+def register_parser(bank_id: str, parser: Union[str, Type[BankOfferParser]]) -> None:
+    """
+    Register the parser of a bank, as a class or as a "module:Class" path imported on first use.
+    """
+    _registered[bank_id] = parser
+    get_parser.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _entry_points() -> Dict[str, EntryPoint]:
+    """
+    The parsers declared by the installed packages, by bank id. Read once: only their metadata is loaded here.
+    """
+    return {entry_point.name: entry_point for entry_point in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def registered_bank_ids() -> List[str]:
+    """
+    The ids of every bank with a parser, without importing any of them.
+    """
+    return sorted({*BUILTIN_PARSERS, *_entry_points(), *_registered})
+
+
+def _load_parser_class(source: ParserSource) -> Type[BankOfferParser]:
+    if isinstance(source, EntryPoint):
+        return source.load()
+    if isinstance(source, str):
+        module_name, _, class_name = source.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+    return source
+
+
+@lru_cache(maxsize=None)
+def get_parser(bank_id: str) -> Optional[BankOfferParser]:
+    """
+    The parser of a bank, or None if there is none. Its module is imported and the parser instantiated
+    on the first call only, the same instance being returned for the rest of the process.
+    """
+    source = _registered.get(bank_id) or _entry_points().get(bank_id) or BUILTIN_PARSERS.get(bank_id)
+    if source is None:
+        return None
+    parser_class = _load_parser_class(source)
+    if not (isinstance(parser_class, type) and issubclass(parser_class, BankOfferParser)):
+        raise TypeError(f"The parser registered for '{bank_id}' is not a BankOfferParser: {parser_class!r}")
+    parser = parser_class()
+    if parser.bank.id != bank_id:
+        raise ValueError(f"{parser_class.__name__} parses '{parser.bank.id}' offers, but is registered for '{bank_id}'")
+    logger.debug(f"Loaded {parser!r} for bank '{bank_id}'")
+    return parser
+
+
+def discover_parsers() -> List[BankOfferParser]:
+    """
+    Every registered parser. This imports all of them: look up a single bank with `get_parser` instead.
+    """
+    return [parser for bank_id in registered_bank_ids() if (parser := get_parser(bank_id)) is not None]
+
+
+def reset_parser_registry() -> None:
+    """
+    Drop the explicit registrations and the cached parsers and entry points.
+    """
+    _registered.clear()
+    _entry_points.cache_clear()
+    get_parser.cache_clear()
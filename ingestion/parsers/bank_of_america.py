@@ -15,13 +15,16 @@ logger = logging.getLogger(__name__)
 
 
 class BankOfAmericaOfferParser(BankOfferParser):
+    offer_tag = "div"
+    offer_class = "deal-logo-wrapper top"
+
     def __init__(self):
         super().__init__(bank_name="Bank of America", offer_type=OfferTypeEnum.CASHBACK)
 
     def _extract_offers(self, soup: BeautifulSoup) -> List[Offer]:
         results: set[Offer] = set()
 
-        deal_wrappers = [tag for tag in soup.find_all("div", class_="deal-logo-wrapper top") if isinstance(tag, Tag)]
+        deal_wrappers = [tag for tag in soup.find_all(self.offer_tag, class_=self.offer_class) if isinstance(tag, Tag)]
         if not deal_wrappers:
             logger.exception(f"No offer wrappers found for {self.bank.name}.")
             raise OfferParsingError(self.bank.name, "No offer wrappers found")
@@ -56,7 +59,7 @@ class BankOfAmericaOfferParser(BankOfferParser):
                     f"""Missing text in span tag. Span: {span_tag}""",
                 )
             offer = Offer(
-                shop=Shop(name=shop_name),
+                shop=Shop.intern(shop_name),
                 bank=self.bank,
                 offer_type=self.offer_type,
                 description=offer_description,
@@ -1,21 +1,36 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import BinaryIO, Iterator, List, Optional, Set
 
-from bs4 import BeautifulSoup
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from selectolax.lexbor import LexborHTMLParser
 
 from cardwise.domain.models.bank import Bank
 from cardwise.domain.models.offer import Offer, OfferTypeEnum
+from cardwise.exceptions import OfferParsingError
+from ingestion.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# BeautifulSoup tree builders, plus "selectolax" which pre-selects the offer elements with a CSS engine
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+
 
 class BankOfferParser(ABC):
     """
     Base class for all bank offer parsers.
     Provides HTML loading and parsing boilerplate.
+
+    Subclasses declare the elements holding one offer each (`offer_tag` with the exact `offer_class`
+    attribute). Only those subtrees are then parsed: through a SoupStrainer for the BeautifulSoup
+    backends, and through a CSS pre-selection for the "selectolax" backend.
     """
 
+    offer_tag: str = ""
+    offer_class: str = ""
+
     def __init__(self, bank_name: Optional[str] = None, offer_type: Optional[OfferTypeEnum] = None):
         if not bank_name:
             logger.error("Bank name must be provided for the parser.")
@@ -23,13 +38,95 @@ class BankOfferParser(ABC):
         if not offer_type:
             logger.error("Offer type must be provided for the parser.")
             raise ValueError("Offer type must be provided for the parser.")
-        self.bank = Bank(name=bank_name)
+        self.bank = Bank.intern(bank_name)
         self.offer_type = offer_type
+        self.backend = settings.html_parser
+
+    @property
+    def offer_selector(self) -> str:
+        """
+        CSS selector equivalent to `soup.find_all(offer_tag, class_=offer_class)`.
+        """
+        return f'{self.offer_tag}[class="{self.offer_class}"]'
+
+    @property
+    def offer_strainer(self) -> SoupStrainer:
+        """
+        SoupStrainer keeping only the offer elements and their descendants.
+        """
+        return SoupStrainer(self.offer_tag, class_=self.offer_class)
 
     def parse(self, html_doc: str) -> List[Offer]:
-        logger.debug("Calling BeautifulSoup...")
-        soup = BeautifulSoup(html_doc, "html.parser")
-        return self._extract_offers(soup)
+        logger.debug(f"Parsing HTML with the '{self.backend}' backend...")
+        return self._extract_offers(self._make_soup(html_doc))
+
+    def _make_soup(self, html_doc: str) -> BeautifulSoup:
+        if self.backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown HTML parser backend '{self.backend}', expected one of {PARSER_BACKENDS}.")
+        if self.backend != "selectolax":
+            if not self.offer_tag:
+                return BeautifulSoup(html_doc, self.backend)
+            # Only build (and keep in memory) the offer subtrees instead of the whole page
+            return BeautifulSoup(html_doc, self.backend, parse_only=self.offer_strainer)
+        if not self.offer_tag:
+            raise ValueError(f"{self.__class__.__name__} does not declare its offer elements, use a soup backend.")
+        offer_nodes = LexborHTMLParser(html_doc).css(self.offer_selector)
+        logger.debug(f"selectolax matched {len(offer_nodes)} offer element(s) with '{self.offer_selector}'")
+        return BeautifulSoup("".join(node.html or "" for node in offer_nodes), "html.parser")
+
+    def iter_parse(self, stream: BinaryIO, chunk_size: Optional[int] = None) -> Iterator[Offer]:
+        """
+        Incrementally parse a document read from a byte stream `chunk_size` bytes at a time, yielding the offers
+        of the offer elements closed by each chunk.
+        Elements outside the offers are dropped as soon as they are closed, so peak memory is bounded by the
+        largest offer element rather than by the whole page.
+        """
+        if not self.offer_tag:
+            raise ValueError(f"{self.__class__.__name__} does not declare its offer elements, it cannot stream.")
+        chunk_size = chunk_size or settings.stream_chunk_size
+        # Decoded as UTF-8 like the downloaded documents, whatever the page declares: libxml2 would fall back
+        # to Latin-1 for pages without a <meta charset>
+        pull_parser = etree.HTMLPullParser(events=("start", "end"), encoding="utf-8")
+        seen: Set[str] = set()
+        fragments: List[str] = []
+        open_offers = 0
+
+        def flush() -> Iterator[Offer]:
+            # Offer elements are handed to `_extract_offers` in batches, one small soup per batch
+            for offer in self._extract_offers(BeautifulSoup("".join(fragments), "html.parser")):
+                if offer.id not in seen:
+                    seen.add(offer.id)
+                    yield offer
+            fragments.clear()
+
+        while True:
+            chunk = stream.read(chunk_size)
+            if chunk:
+                pull_parser.feed(chunk)
+            else:
+                pull_parser.close()
+            for event, element in pull_parser.read_events():
+                is_offer = element.tag == self.offer_tag and element.get("class") == self.offer_class
+                if event == "start":
+                    open_offers += is_offer
+                    continue
+                open_offers -= is_offer
+                if open_offers:
+                    continue  # Inside an offer element, kept whole until the outermost one closes
+                if is_offer:
+                    fragments.append(lxml.html.tostring(element, encoding="unicode", with_tail=False))
+                # Free what has been processed: the element's content and its already closed siblings
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]  # type: ignore
+            if fragments:
+                yield from flush()
+            if not chunk:
+                break
+        if not seen:
+            logger.error(f"No offer elements found for {self.bank.name}.")
+            raise OfferParsingError(self.bank.name, f"No '{self.offer_selector}' elements found in the stream")
+        logger.debug(f"Streaming parse over. Found {len(seen)} offers.")
 
     @abstractmethod
     def _extract_offers(self, soup: BeautifulSoup) -> List[Offer]:
@@ -1,6 +1,7 @@
 import logging
 import re
 from typing import List, Optional
+from urllib.parse import unquote
 
 from bs4 import BeautifulSoup, Tag
 
@@ -17,19 +18,16 @@ logger = logging.getLogger(__name__)
 
 
 class CapitalOneOfferParser(BankOfferParser):
+    offer_tag = "div"
+    offer_class = "standard-tile relative flex flex-col justify-between w-full h-full mt-0"
+
     def __init__(self):
         super().__init__(bank_name="Capital One", offer_type=OfferTypeEnum.POINTS)
 
     def _extract_offers(self, soup: BeautifulSoup) -> List[Offer]:
         results: set[Offer] = set()
 
-        tiles = [
-            tag
-            for tag in soup.find_all(
-                "div", class_="standard-tile relative flex flex-col justify-between w-full h-full mt-0"
-            )
-            if isinstance(tag, Tag)
-        ]
+        tiles = [tag for tag in soup.find_all(self.offer_tag, class_=self.offer_class) if isinstance(tag, Tag)]
         if not tiles:
             logger.warning("No tiles found in the HTML document.")
             raise OfferParsingError(self.bank.name, "No tile elements found")
@@ -41,7 +39,8 @@ class CapitalOneOfferParser(BankOfferParser):
                 logger.warning("Missing 'src' attribute in image tag.")
                 raise OfferShopNameParsingError(self.bank.name, "Missing 'src' in image tag, no URL to get shop name")
             src_attr = img_tag["src"]
-            src_url = src_attr[0] if isinstance(src_attr, list) else str(src_attr)
+            # Unquoted: lxml percent-encodes the non-ASCII characters of URLs when streaming
+            src_url = unquote(src_attr[0] if isinstance(src_attr, list) else str(src_attr))
             match: Optional[re.Match[str]] = re.search(r"domain=([^.]+)\.", src_url)
             if not match:
                 logger.warning("Shop name not found in URL.")
@@ -65,7 +64,7 @@ class CapitalOneOfferParser(BankOfferParser):
                 raise OfferDescriptionParsingError(self.bank.name, f"""Missing text in div tag. Div: {offer_divs[1]}""")
 
             offer = Offer(
-                shop=Shop(name=shop_name),
+                shop=Shop.intern(shop_name),
                 bank=self.bank,
                 offer_type=self.offer_type,
                 description=offer_description,
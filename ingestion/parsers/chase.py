@@ -16,12 +16,15 @@ logger = logging.getLogger(__name__)
 
 
 class ChaseOfferParser(BankOfferParser):
+    offer_tag = "div"
+    offer_class = "r9jbije r9jbijl"
+
     def __init__(self):
         super().__init__(bank_name="Chase", offer_type=OfferTypeEnum.CASHBACK)
 
     def _extract_offers(self, soup: BeautifulSoup) -> List[Offer]:
         results: set[Offer] = set()
-        divs = [tag for tag in soup.find_all("div", class_="r9jbije r9jbijl") if isinstance(tag, Tag)]
+        divs = [tag for tag in soup.find_all(self.offer_tag, class_=self.offer_class) if isinstance(tag, Tag)]
         if not divs:
             logger.error(f"No divs found for {self.bank.name}.")
             raise OfferParsingError(self.bank.name, "No valid divs found")
@@ -54,7 +57,7 @@ class ChaseOfferParser(BankOfferParser):
                 raise OfferDescriptionParsingError(self.bank.name, f"""Missing text in span tag. Span: {spans[1]}""")
 
             offer = Offer(
-                shop=Shop(name=shop_name),
+                shop=Shop.intern(shop_name),
                 bank=self.bank,
                 offer_type=self.offer_type,
                 description=offer_description,
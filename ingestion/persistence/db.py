@@ -1,7 +1,9 @@
 import logging
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, create_engine
 
+from cardwise.persistence.migrations import run_migrations
+from cardwise.persistence.sqlite import apply_sqlite_pragmas
 from ingestion.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -11,6 +13,8 @@ connect_args = {"check_same_thread": False} if settings.database_url.startswith(
 
 # Create the engine from settings
 engine = create_engine(settings.database_url, echo=settings.log_level == "DEBUG", connect_args=connect_args)
+if settings.sqlite_tuning:
+    apply_sqlite_pragmas(engine)
 
 
 def get_session() -> Session:
@@ -22,9 +26,11 @@ def get_session() -> Session:
 
 def init_db() -> None:
     """
-    Create tables in the database. Should be called once at startup.
+    Create the missing tables and apply the pending schema migrations. Should be called once at startup.
     """
+    from cardwise.persistence.models.bank_document_db import BankDocumentDB  # type: ignore # noqa: F401
+    from cardwise.persistence.models.ingestion_run_db import IngestionRunDB  # type: ignore # noqa: F401
     from cardwise.persistence.models.offer_db import OfferDB  # type: ignore # noqa: F401
 
     logger.info("Initializing database and creating tables...")
-    SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
@@ -1,17 +1,77 @@
+import io
 import logging
-from typing import List
+from dataclasses import dataclass, fields
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
 
-from sqlmodel import Session, delete
+from sqlalchemy import bindparam, insert, text, update
+from sqlmodel import Session, delete, func, select
 
+from cardwise.domain.models.bank import Bank
 from cardwise.domain.models.offer import Offer
+from cardwise.persistence.models.bank_document_db import BankDocumentDB
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
 from cardwise.persistence.models.offer_db import OfferDB
 
 logger = logging.getLogger(__name__)
 
+OFFER_TABLE = OfferDB.__table__  # type: ignore
+COPY_NULL = "\\N"
+# Keep IN (...) lists under SQLite's bound parameter limit
+ID_BATCH_SIZE = 500
+
+Row = Dict[str, Any]
+T = TypeVar("T")
+
+
+def _chunks(items: List[T], size: int) -> Iterator[List[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _copy_value(value: Any) -> str:
+    """
+    A value as a field of a COPY ... CSV line. Every value is quoted but NULL, the only unquoted field,
+    so that no string (not even a literal COPY_NULL) is read back as NULL.
+    """
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, Enum):
+        value = value.name  # SQLAlchemy stores enums by name
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_line(values: Iterable[Any]) -> str:
+    return ",".join(map(_copy_value, values)) + "\n"
+
+
+@dataclass
+class SyncStats:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def __add__(self, other: "SyncStats") -> "SyncStats":
+        return SyncStats(*(getattr(self, field.name) + getattr(other, field.name) for field in fields(self)))
+
 
 class OfferRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, bulk: bool = True, chunk_size: int = 5000):
+        """
+        `bulk` feeds rows straight to the database in chunks of `chunk_size` (COPY on PostgreSQL,
+        executemany elsewhere) instead of going through the ORM unit of work.
+        """
         self.session = session
+        self.bulk = bulk
+        self.chunk_size = chunk_size
 
     def delete_all(self) -> None:
         """
@@ -30,8 +90,180 @@ class OfferRepository:
             logger.info("No offers to insert.")
             return
 
-        logger.info(f"Inserting {len(offers)} offer(s) into the database...")
-        for offer in offers:
-            self.session.add(OfferDB.from_domain(offer))
+        logger.info(f"Inserting {len(offers)} offer(s) into the database (bulk={self.bulk})...")
+        if self.bulk:
+            self._bulk_insert([OfferDB.row_from_domain(offer) for offer in offers])
+        else:
+            for offer in offers:
+                self.session.add(OfferDB.from_domain(offer))
         self.session.commit()
         logger.info("Insert complete.")
+
+    def sync(self, offers: List[Offer]) -> SyncStats:
+        """
+        Make the offers table match `offers` in a single transaction, keyed on the deterministic Offer.id:
+        each bank is synced with `sync_bank`, the banks without any offer are deleted and everything is
+        committed by `finish_sync`, so readers never see a partial or empty catalog.
+        """
+        offers_by_bank: Dict[str, List[Offer]] = {}
+        for offer in offers:
+            offers_by_bank.setdefault(offer.bank.id, []).append(offer)
+        stats = SyncStats()
+        try:
+            for bank_offers in offers_by_bank.values():
+                stats += self.sync_bank(bank_offers[0].bank, bank_offers)
+            stats.deleted += self.delete_banks_except(offers_by_bank)
+            self.finish_sync(stats)
+        except BaseException:
+            self.session.rollback()
+            raise
+        return stats
+
+    def sync_bank(self, bank: Bank, offers: List[Offer]) -> SyncStats:
+        """
+        Make the offers of a single bank match `offers` in the current transaction, without committing:
+        new offers are inserted, changed ones updated and missing ones deleted. The bank's stored offers are
+        found by bank id rather than display name, so that the offers of a renamed bank are updated in place.
+        The other banks are left untouched: call `finish_sync` once every bank has been synced, to commit
+        them all at once so that readers never see a partially synced catalog.
+        """
+        rows = {row["id"]: row for row in map(OfferDB.row_from_domain, offers)}
+        bank_names = [bank_name for bank_name in self._stored_bank_names() if Bank.intern(bank_name).id == bank.id]
+        statement = select(OfferDB.id, OfferDB.shop_name, OfferDB.bank_name, OfferDB.expiry_date).where(
+            OfferDB.bank_name.in_(bank_names)  # type: ignore
+        )
+        existing = {
+            offer_id: (shop_name, bank_name, expiry_date)
+            for offer_id, shop_name, bank_name, expiry_date in self.session.exec(statement)
+        }
+
+        to_insert = [row for offer_id, row in rows.items() if offer_id not in existing]
+        to_update = [
+            row
+            for offer_id, row in rows.items()
+            if offer_id in existing and existing[offer_id] != (row["shop_name"], row["bank_name"], row["expiry_date"])
+        ]
+        to_delete = [offer_id for offer_id in existing if offer_id not in rows]
+        stats = SyncStats(
+            inserted=len(to_insert),
+            updated=len(to_update),
+            deleted=len(to_delete),
+            unchanged=len(rows) - len(to_insert) - len(to_update),
+        )
+        logger.info(f"Syncing offers of {bank.name}: {stats}")
+        if not stats.changed:
+            return stats
+
+        connection = self.session.connection()
+        for chunk in _chunks(to_delete, ID_BATCH_SIZE):
+            connection.execute(delete(OFFER_TABLE).where(OFFER_TABLE.c.id.in_(chunk)))
+        if to_update:
+            connection.execute(
+                update(OFFER_TABLE)
+                .where(OFFER_TABLE.c.id == bindparam("_id"))
+                .values(
+                    shop_name=bindparam("shop_name"),
+                    bank_name=bindparam("bank_name"),
+                    expiry_date=bindparam("expiry_date"),
+                ),
+                [{**row, "_id": row["id"]} for row in to_update],
+            )
+        if to_insert:
+            self._bulk_insert(to_insert)
+        return stats
+
+    def delete_banks_except(self, bank_ids: Iterable[str]) -> int:
+        """
+        Delete the offers of every bank but `bank_ids`, e.g. of the banks without an HTML document anymore,
+        in the current transaction, without committing. Their document content hashes are deleted too, so that
+        a document uploaded again is ingested even if unchanged.
+        Returns the number of offers deleted.
+        """
+        kept = set(bank_ids)
+        connection = self.session.connection()
+        document_table = BankDocumentDB.__table__  # type: ignore
+        connection.execute(delete(document_table).where(document_table.c.bank_id.not_in(kept)))
+        bank_names = [bank_name for bank_name in self._stored_bank_names() if Bank.intern(bank_name).id not in kept]
+        if not bank_names:
+            return 0
+        result = connection.execute(delete(OFFER_TABLE).where(OFFER_TABLE.c.bank_name.in_(bank_names)))
+        if result.rowcount:
+            logger.info(f"Deleting {result.rowcount} offer(s) of banks no longer ingested.")
+        return result.rowcount
+
+    def finish_sync(
+        self, stats: SyncStats, content_hashes: Optional[Dict[str, str]] = None
+    ) -> Optional[IngestionRunDB]:
+        """
+        Commit a series of `sync_bank` calls whose stats add up to `stats`, along with the content hash of
+        their HTML documents, in a single transaction. When something changed, a new ingestion run is recorded
+        in that same transaction, bumping the data generation, and the planner statistics are refreshed.
+        """
+        self._merge_document_hashes(content_hashes or {})
+        if not stats.changed:
+            self.session.commit()
+            logger.info("Nothing changed, no ingestion run recorded.")
+            return None
+        offer_count = self.session.exec(select(func.count()).select_from(OfferDB)).one()
+        run = IngestionRunDB(offer_count=offer_count)
+        self.session.add(run)
+        self._analyze()
+        self.session.commit()
+        self.session.refresh(run)
+        logger.info(f"Sync complete, recorded ingestion run #{run.id} with {offer_count} offer(s).")
+        return run
+
+    def _stored_bank_names(self) -> List[str]:
+        """
+        The distinct bank names of the stored offers. A bank renamed since its last sync has several.
+        """
+        return list(self.session.exec(select(OfferDB.bank_name).distinct()))
+
+    def _analyze(self) -> None:
+        """
+        Refresh the planner statistics of the offers table, so that lookups use the most selective index.
+        Runs in the current transaction, without committing.
+        """
+        connection = self.session.connection()
+        connection.execute(text(f"ANALYZE {OFFER_TABLE.name}"))
+
+    def _bulk_insert(self, rows: List[Row]) -> None:
+        """
+        Insert rows in the current transaction, without committing.
+        """
+        if self.session.get_bind().dialect.name == "postgresql":
+            self._copy_rows(rows)
+            return
+        # Core executemany on the session's connection: one prepared statement per chunk, and no ORM
+        # bulk persistence (which splits rows into one INSERT per distinct set of NULL columns)
+        connection = self.session.connection()
+        for chunk in _chunks(rows, self.chunk_size):
+            connection.execute(insert(OFFER_TABLE), chunk)
+
+    def _copy_rows(self, rows: List[Row]) -> None:
+        """
+        Stream rows to PostgreSQL with COPY ... FROM STDIN, one CSV buffer per chunk.
+        """
+        columns = list(rows[0])
+        copy_sql = f"COPY {OFFER_TABLE.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        # The raw psycopg2 connection of the session, so COPY runs in the same transaction
+        dbapi_connection = self.session.connection().connection
+        with dbapi_connection.cursor() as cursor:
+            for chunk in _chunks(rows, self.chunk_size):
+                buffer = io.StringIO("".join(_copy_line(row[column] for column in columns) for row in chunk))
+                cursor.copy_expert(copy_sql, buffer)  # type: ignore
+
+    def get_document_hashes(self) -> Dict[str, str]:
+        """
+        Return the content hash of the last ingested HTML document of each bank, by bank_id.
+        """
+        return dict(self.session.exec(select(BankDocumentDB.bank_id, BankDocumentDB.content_hash)).all())
+
+    def _merge_document_hashes(self, content_hashes: Dict[str, str]) -> None:
+        """
+        Upsert content hashes in the current transaction, without committing.
+        """
+        for bank_id, content_hash in content_hashes.items():
+            self.session.merge(BankDocumentDB(bank_id=bank_id, content_hash=content_hash))
+        if content_hashes:
+            logger.info(f"Recording the content hash of {len(content_hashes)} document(s): {sorted(content_hashes)}")
@@ -1,27 +1,50 @@
 import logging
-from typing import List, Tuple
+import time
+from functools import partial
+from typing import BinaryIO, Callable, TypeVar
 
-from ingestion.gcs.gcs_client import GCSClient
+from ingestion.gcs.storage import HTMLStorage
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-def load_htmls() -> List[Tuple[str, str]]:
+
+def bank_id_from_path(file_name: str) -> str:
+    # Assuming the file name format is 'data/bank_htmls/{bank_id}.html'
+    return file_name.split("/")[-1].split(".")[0]
+
+
+def with_retries(action: Callable[[], T], description: str, max_retries: int, retry_backoff: float) -> T:
     """
-    Load HTML files from a private GCS bucket.
-    Returns:
-        List of (bank_id, html_content)
+    Run `action`, retrying up to `max_retries` times with exponential backoff.
     """
-    gcs = GCSClient()
-    html_files = gcs.list_html_files()
+    attempt = 0
+    while True:
+        try:
+            return action()
+        except Exception as e:
+            if attempt >= max_retries:
+                logger.error(f"{description} failed after {attempt + 1} attempt(s): {e}")
+                raise
+            delay = retry_backoff * 2**attempt
+            attempt += 1
+            logger.warning(f"{description} failed ({e}), retry {attempt}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
 
-    results: List[Tuple[str, str]] = []
+def download_with_retries(storage: HTMLStorage, file_name: str, max_retries: int, retry_backoff: float) -> str:
+    """
+    Download a file, retrying up to `max_retries` times with exponential backoff.
+    """
+    return with_retries(
+        partial(storage.download_file_content, file_name), f"Download of {file_name}", max_retries, retry_backoff
+    )
 
-    for file_name in html_files:
-        # Retrieve bank id assuming the file name format is 'data/bank_htmls/{bank_id}.html'
-        bank_id = file_name.split("/")[-1].split(".")[0]
-        html_content = gcs.download_file_content(file_name)
-        results.append((bank_id, html_content))
-        logger.debug(f"Loaded HTML for bank '{bank_id}' from GCS")
 
-    return results
+def open_with_retries(storage: HTMLStorage, file_name: str, max_retries: int, retry_backoff: float) -> BinaryIO:
+    """
+    Open a file as a byte stream, retrying up to `max_retries` times with exponential backoff.
+    Only opening the stream is retried: a failure while reading it fails the document.
+    """
+    return with_retries(partial(storage.open_file, file_name), f"Opening {file_name}", max_retries, retry_backoff)
@@ -1,42 +1,215 @@
 # ingestion/pipeline/offer_ingestion_pipeline.py
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack, closing
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import Dict, List, NamedTuple, Optional
 
 from cardwise.domain.models.offer import Offer
-from ingestion.parser_registry import discover_parsers
-from ingestion.persistence.repository import OfferRepository
-from ingestion.pipeline.load_htmls import load_htmls
+from ingestion.core.config import settings
+from ingestion.gcs.gcs_client import GCSClient
+from ingestion.gcs.storage import HTMLStorage
+from ingestion.parser_registry import get_parser
+from ingestion.parsers.base import BankOfferParser
+from ingestion.persistence.repository import OfferRepository, SyncStats
+from ingestion.pipeline.load_htmls import bank_id_from_path, download_with_retries, open_with_retries
+from ingestion.pipeline.stages import Stage, run_stages
 
 logger = logging.getLogger(__name__)
 
 
+class Document(NamedTuple):
+    """
+    An HTML document going through the pipeline stages.
+    """
+
+    bank_id: str
+    file_name: str
+    parser: BankOfferParser
+    html_doc: Optional[str] = None  # None until downloaded, and when stream parsing
+    offers: Optional[List[Offer]] = None  # Set once parsed
+    error: Optional[Exception] = None  # The download or parsing failure
+
+
+class ParserPool:
+    """
+    Worker processes parsing HTML documents. They are started from a forkserver (spawned where it is unavailable)
+    rather than forked from the pipeline's threads, which may hold locks. A pool broken by a dying worker
+    (e.g. killed when out of memory) is replaced, and the documents it was parsing are retried once in the new one.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._executor = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context(method))
+
+    def parse(self, parser: BankOfferParser, html_doc: str) -> List[Offer]:
+        executor = self._executor
+        try:
+            return executor.submit(parser.parse, html_doc).result()
+        except BrokenProcessPool as e:
+            with self._lock:
+                if self._executor is executor:
+                    logger.warning(f"⚠️ A parse worker died ({e}), restarting the worker processes")
+                    executor.shutdown(wait=False)
+                    self._executor = self._start()
+                executor = self._executor
+        return executor.submit(parser.parse, html_doc).result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParserPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+
 class OfferIngestionPipeline:
-    def __init__(self, html_folder: Path, repository: OfferRepository):
+    def __init__(
+        self,
+        html_folder: Path,
+        repository: OfferRepository,
+        storage: Optional[HTMLStorage] = None,
+        force: bool = False,
+    ):
+        """
+        Unless `force` is set, HTML documents whose content hash did not change since their last
+        ingestion are neither downloaded nor parsed, and their stored offers are kept.
+        """
         self.html_folder = html_folder
         self.repository = repository
-        self.parsers = discover_parsers()
+        self.storage = storage
+        self.force = force
 
-    def run(self) -> List[Offer]:
+    def run(self) -> SyncStats:
+        """
+        Download, parse and write the documents as overlapping stages connected by bounded queues:
+        `download_concurrency` download threads, `parse_workers` parsers, and a single writer applying each bank
+        as soon as it is parsed. Only about `pipeline_queue_size` documents per stage are held in memory at a time.
+        Every bank is applied in a single transaction, committed once all the documents went through, so readers
+        never see a partially synced catalog. A document that fails to download or parse keeps its previously
+        stored offers.
+        Returns:
+            The sync stats summed over all the banks
+        """
         logger.info("🔄 Running ingestion pipeline...")
-        offer_docs = load_htmls()
-        parser_map = {parser.bank.id: parser for parser in self.parsers}
-
-        offers: List[Offer] = []
+        storage = self.storage or GCSClient()
 
-        for bank_id, html_doc in offer_docs:
-            parser = parser_map.get(bank_id)
+        html_hashes = storage.list_html_hashes()
+        known_hashes = {} if self.force else self.repository.get_document_hashes()
+        documents: List[Document] = []
+        unchanged: List[str] = []
+        failed: List[str] = []
+        for file_name, content_hash in html_hashes.items():
+            bank_id = bank_id_from_path(file_name)
+            if known_hashes.get(bank_id) == content_hash:
+                unchanged.append(bank_id)
+                continue
+            try:
+                # Only the parsers of the documents to parse are imported
+                parser = get_parser(bank_id)
+            except Exception as e:
+                logger.exception(f"❌ Could not load the parser of bank '{bank_id}': {e}")
+                failed.append(bank_id)
+                continue
             if not parser:
-                logger.warning(f"❌ No parser found for bank: '{bank_id}', skipping file: {html_doc}")
+                logger.warning(f"❌ No parser found for bank: '{bank_id}', skipping file: {file_name}")
                 continue
-            logger.info(f"📝 Parsing html docs: {bank_id} using {parser.__class__.__name__}")
-            parsed = parser.parse(html_doc)
-            logger.info(f"✅ Parsed {len(parsed)} offer(s) from {bank_id}")
-            offers.extend(parsed)
+            documents.append(Document(bank_id, file_name, parser))
+        if unchanged:
+            logger.info(f"⏭️ Skipping {len(unchanged)} unchanged document(s), keeping their offers: {sorted(unchanged)}")
+
+        stats = SyncStats()
+        synced_hashes: Dict[str, str] = {}
+        try:
+            with ExitStack() as stack:
+                stages = self._stages(storage, stack, len(documents))
+                results = stack.enter_context(closing(run_stages(documents, stages, settings.pipeline_queue_size)))
+                for document in results:
+                    if document.error is not None:
+                        failed.append(document.bank_id)
+                        continue
+                    offers = document.offers or []
+                    logger.info(f"✅ Parsed {len(offers)} offer(s) from {document.bank_id}, syncing them...")
+                    stats += self.repository.sync_bank(document.parser.bank, offers)
+                    synced_hashes[document.bank_id] = html_hashes[document.file_name]
+
+            if failed:
+                logger.error(f"❌ Ingestion failed for {sorted(failed)}, keeping their previously stored offers.")
+            stats.deleted += self.repository.delete_banks_except([*synced_hashes, *failed, *unchanged])
+            self.repository.finish_sync(stats, synced_hashes)
+        except BaseException:
+            # Nothing is published: the banks applied before the failure are rolled back too
+            self.repository.session.rollback()
+            raise
+        logger.info(f"🎉 Ingestion pipeline complete: {stats}")
+        return stats
+
+    def _stages(self, storage: HTMLStorage, stack: ExitStack, document_count: int) -> List[Stage]:
+        """
+        The download and parse stages. Documents are parsed in worker processes (shut down with `stack`)
+        unless `parse_workers` is 1 or there is a single document. When stream parsing, the parse stage
+        reads the documents from the storage itself, in-process.
+        """
+        parse_workers = min(settings.parse_workers or os.cpu_count() or 1, max(document_count, 1))
+        if settings.stream_parsing:
+            return [Stage("parse", partial(parse_document, stream_from=storage), workers=parse_workers)]
+        pool = stack.enter_context(ParserPool(parse_workers)) if parse_workers > 1 else None
+        return [
+            Stage("download", partial(download_document, storage), workers=settings.download_concurrency),
+            Stage("parse", partial(parse_document, pool=pool), workers=parse_workers),
+        ]
+
+
+def download_document(storage: HTMLStorage, document: Document) -> Document:
+    """
+    The download stage: fetch the HTML of a document, retrying `download_max_retries` times.
+    A failure is recorded on the document instead of being raised.
+    """
+    try:
+        html_doc = download_with_retries(
+            storage, document.file_name, settings.download_max_retries, settings.download_retry_backoff
+        )
+    except Exception as e:
+        return document._replace(error=e)
+    return document._replace(html_doc=html_doc)
 
-        logger.info(f"📦 Going to insert {len(offers)} offer(s) into the database...")
-        self.repository.delete_all()
-        self.repository.insert_many(offers)
 
-        logger.info("🎉 Ingestion pipeline complete.")
-        return offers
+def parse_document(
+    document: Document, pool: Optional[ParserPool] = None, stream_from: Optional[HTMLStorage] = None
+) -> Document:
+    """
+    The parse stage: parse a downloaded document in `pool` (in-process without one), or incrementally
+    from a byte stream of `stream_from`, opened with the download retries, so that it is never held in memory
+    as a whole.
+    A failure is recorded on the document instead of being raised, so that it does not abort the others.
+    """
+    if document.error is not None:
+        return document
+    logger.info(f"📝 Parsing html docs: {document.bank_id} using {document.parser.__class__.__name__}")
+    try:
+        if stream_from is not None:
+            stream = open_with_retries(
+                stream_from, document.file_name, settings.download_max_retries, settings.download_retry_backoff
+            )
+            with stream:
+                offers = list(document.parser.iter_parse(stream))
+        elif pool is not None:
+            offers = pool.parse(document.parser, document.html_doc or "")
+        else:
+            offers = document.parser.parse(document.html_doc or "")
+    except Exception as e:
+        logger.error(f"❌ Failed to parse {document.bank_id}: {e!r}")
+        return document._replace(html_doc=None, error=e)
+    return document._replace(html_doc=None, offers=offers)
@@ -0,0 +1,111 @@
+import logging
+import threading
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two checks of the cancellation while waiting on a queue
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """
+    A step of the pipeline: `workers` threads applying `func` to the items handed over by the previous stage.
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+def _put(queue: "Queue[Any]", item: Any, cancelled: threading.Event) -> bool:
+    while not cancelled.is_set():
+        try:
+            queue.put(item, timeout=POLL_INTERVAL)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def _get(queue: "Queue[Any]", cancelled: threading.Event) -> Any:
+    while not cancelled.is_set():
+        try:
+            return queue.get(timeout=POLL_INTERVAL)
+        except Empty:
+            continue
+    return _DONE
+
+
+def run_stages(items: Iterable[Any], stages: List[Stage], queue_size: int) -> Iterator[Any]:
+    """
+    Feed `items` through the `stages` and yield the outputs of the last one, in completion order.
+    Consecutive stages are connected by queues holding up to `queue_size` items: a stage blocks as soon as
+    the next one lags behind, so at most about `queue_size + workers` items are in flight per stage.
+    The first exception raised by a stage, or by `items`, cancels all of them and is re-raised to the consumer.
+    Closing the generator early cancels the stages too.
+    """
+    cancelled = threading.Event()
+    errors: List[BaseException] = []
+    queues: List["Queue[Any]"] = [Queue(maxsize=max(queue_size, 1)) for _ in range(len(stages) + 1)]
+    threads: List[threading.Thread] = []
+
+    def feed() -> None:
+        try:
+            for item in items:
+                if not _put(queues[0], item, cancelled):
+                    return
+            _put(queues[0], _DONE, cancelled)
+        except BaseException as e:
+            logger.error(f"Reading the pipeline items failed, cancelling the pipeline: {e!r}")
+            errors.append(e)
+            cancelled.set()
+
+    def run_stage(stage: Stage, inbox: "Queue[Any]", outbox: "Queue[Any]", running: List[int]) -> None:
+        try:
+            while (item := _get(inbox, cancelled)) is not _DONE:
+                if not _put(outbox, stage.func(item), cancelled):
+                    return
+            _put(inbox, _DONE, cancelled)  # Hand the end of the items over to the other workers of the stage
+        except BaseException as e:
+            logger.error(f"Stage '{stage.name}' failed, cancelling the pipeline: {e!r}")
+            errors.append(e)
+            cancelled.set()
+        finally:
+            with lock:
+                running[0] -= 1
+                last = not running[0]
+            if last:
+                _put(outbox, _DONE, cancelled)
+
+    lock = threading.Lock()
+    threads.append(threading.Thread(target=feed, name="stage-feed", daemon=True))
+    for index, stage in enumerate(stages):
+        workers = max(stage.workers, 1)
+        running = [workers]
+        threads.extend(
+            threading.Thread(
+                target=run_stage,
+                args=(stage, queues[index], queues[index + 1], running),
+                name=f"stage-{stage.name}-{worker}",
+                daemon=True,
+            )
+            for worker in range(workers)
+        )
+    for thread in threads:
+        thread.start()
+
+    try:
+        while (output := _get(queues[-1], cancelled)) is not _DONE:
+            yield output
+        if errors:
+            raise errors[0]
+    finally:
+        cancelled.set()
+        for thread in threads:
+            thread.join()
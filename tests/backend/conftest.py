@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from backend.app.api import health, offers
+from backend.app.api.caching import response_cache
+from backend.app.core.config import settings
+from backend.app.core.lifespan import lifespan
+from backend.app.services.offer_service import search_cache
+from backend.app.services.shop_index import reset_shop_index
+from cardwise.domain.models import Bank, Offer, OfferTypeEnum, Shop
+from cardwise.persistence.migrations import run_migrations
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
+from cardwise.persistence.models.offer_db import OfferDB
+
+
+def make_app() -> FastAPI:
+    """
+    The routers of backend.app.main, without its logging setup.
+    """
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(offers.router, prefix="/offers")
+    app.include_router(health.router)
+    return app
+
+
+@pytest.fixture(name="api_database_url")
+def api_database_url_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    database_url = f"sqlite:///{tmp_path / 'api.db'}"
+    engine = create_engine(database_url)
+    run_migrations(engine)
+    engine.dispose()
+    monkeypatch.setattr(settings, "database_url", database_url)
+    return database_url
+
+
+@pytest.fixture(name="ingest")
+def ingest_fixture(api_database_url: str) -> Callable[..., None]:
+    """
+    Store offers of the given shop names and record an ingestion run, bumping the data generation.
+    """
+
+    def ingest(*shop_names: str, bank_name: str = "Chase") -> None:
+        engine = create_engine(api_database_url)
+        with Session(engine) as session:
+            session.add_all(
+                OfferDB.from_domain(
+                    Offer(
+                        shop=Shop(name=name),
+                        bank=Bank(name=bank_name),
+                        offer_type=OfferTypeEnum.MISC,
+                        description="5%",
+                    )
+                )
+                for name in shop_names
+            )
+            session.add(IngestionRunDB(offer_count=len(shop_names)))
+            session.commit()
+        engine.dispose()
+
+    return ingest
+
+
+@pytest.fixture(name="client")
+def client_fixture(api_database_url: str) -> Iterator[TestClient]:
+    """
+    A client of the API started on the `api_database_url` database, with empty caches.
+    """
+    reset_shop_index()
+    search_cache.clear()
+    response_cache.clear()
+    with TestClient(make_app()) as client:
+        yield client
+    reset_shop_index()
+    search_cache.clear()
+    response_cache.clear()
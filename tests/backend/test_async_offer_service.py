@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import AsyncIterator, List
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.db.session import get_async_database_url
+from backend.app.services.async_offer_service import AsyncOfferService
+from backend.app.services.offer_service import OfferService, search_cache
+from backend.app.services.shop_index import reset_shop_index
+from cardwise.domain.models import Bank, Offer, OfferRecord, OfferTypeEnum, Shop
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
+from cardwise.persistence.models.offer_db import OfferDB
+
+pytestmark = pytest.mark.anyio
+
+SHOP_NAMES = ["Adidas", "Adidaz", "Nike", "Puma", "Starbucks"]
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(name="database_url")
+def database_url_fixture(tmp_path: Path) -> str:
+    reset_shop_index()
+    search_cache.clear()
+    database_url = f"sqlite:///{tmp_path / 'offers.db'}"
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            OfferDB.from_domain(
+                Offer(shop=Shop(name=name), bank=Bank(name="Bank A"), offer_type=OfferTypeEnum.MISC, description="5%")
+            )
+            for name in SHOP_NAMES
+        )
+        session.add(IngestionRunDB(offer_count=len(SHOP_NAMES)))
+        session.commit()
+    engine.dispose()
+    return database_url
+
+
+@pytest.fixture(name="async_session")
+async def async_session_fixture(database_url: str) -> AsyncIterator[AsyncSession]:
+    engine = create_async_engine(get_async_database_url(database_url))
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+    reset_shop_index()
+
+
+def sync_service(database_url: str) -> OfferService:
+    return OfferService(Session(create_engine(database_url)), threshold=75)
+
+
+def by_id(records: List[OfferRecord]) -> List[OfferRecord]:
+    return sorted(records, key=lambda record: record.id)
+
+
+async def test_async_queries_match_sync_queries(database_url: str, async_session: AsyncSession):
+    service = AsyncOfferService(async_session, threshold=75)
+    expected = sync_service(database_url)
+
+    assert by_id(await service.list_offer_records()) == by_id(expected.list_offer_records())
+    assert by_id(await service.fuzzy_search_records(["adidas"])) == by_id(expected.fuzzy_search_records(["adidas"]))
+    assert await service.list_offer_records_page(limit=2) == expected.list_offer_records_page(limit=2)
+
+
+async def test_async_iter_offer_record_batches(async_session: AsyncSession):
+    service = AsyncOfferService(async_session)
+
+    batches = [batch async for batch in service.iter_offer_record_batches(batch_size=2)]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert sorted(record.shop_name for batch in batches for record in batch) == SHOP_NAMES
+
+
+async def test_async_page_rejects_invalid_cursor(async_session: AsyncSession):
+    with pytest.raises(ValueError):
+        await AsyncOfferService(async_session).list_offer_records_page(cursor="%%%")
+
+
+def test_get_async_database_url():
+    assert get_async_database_url("sqlite:///./cardwise.db") == "sqlite+aiosqlite:///./cardwise.db"
+    assert get_async_database_url("postgresql+psycopg2://u:p@db/cardwise") == "postgresql+asyncpg://u:p@db/cardwise"
+    with pytest.raises(ValueError):
+        get_async_database_url("mysql://u@db/cardwise")
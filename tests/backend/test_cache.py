@@ -0,0 +1,67 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from backend.app.api.caching import etag_matches, make_etag, validator_headers
+from backend.app.core.cache import LRUCache
+
+
+def test_lru_cache_evicts_the_least_recently_used_entry():
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1}
+
+
+def test_lru_cache_expires_entries_after_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = [1000.0]
+    monkeypatch.setattr("backend.app.core.cache.time.monotonic", lambda: now[0])
+    cache: LRUCache[str, int] = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+
+    now[0] += 59
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_with_zero_size_stores_nothing():
+    cache: LRUCache[str, int] = LRUCache(maxsize=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matches",
+    [
+        (None, False),
+        ('"gen-6"', False),
+        ('"gen-7"', True),
+        ('W/"gen-7"', True),
+        ('"gen-6", "gen-7"', True),
+        ("*", True),
+    ],
+)
+def test_etag_matches(if_none_match: str, matches: bool):
+    assert etag_matches(if_none_match, make_etag(7)) is matches
+
+
+def test_last_modified_reads_run_times_as_utc(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    try:
+        headers = validator_headers(7, datetime(2025, 6, 18, 22, 10, 49))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert headers["Last-Modified"] == "Wed, 18 Jun 2025 22:10:49 GMT"
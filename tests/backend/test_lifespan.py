@@ -0,0 +1,123 @@
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.app.api import health, offers
+from backend.app.api.caching import response_cache
+from backend.app.core.config import settings
+from backend.app.core.lifespan import lifespan
+from backend.app.db import session as db_session
+from backend.app.db.session import get_pool_options
+from backend.app.services import shop_index
+from backend.app.services.offer_service import search_cache
+from cardwise.domain.models import Bank, Offer, OfferTypeEnum, Shop
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
+from cardwise.persistence.models.offer_db import OfferDB
+
+
+@pytest.fixture(name="database_url")
+def database_url_fixture(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    database_url = f"sqlite:///{tmp_path / 'offers.db'}"
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            OfferDB.from_domain(
+                Offer(shop=Shop(name="Nike"), bank=Bank(name="Bank A"), offer_type=OfferTypeEnum.MISC, description="5%")
+            )
+        )
+        session.add(IngestionRunDB(offer_count=1))
+        session.commit()
+    engine.dispose()
+    monkeypatch.setattr(settings, "database_url", database_url)
+    shop_index.reset_shop_index()
+    yield database_url
+    shop_index.reset_shop_index()
+
+
+LEGACY_SCHEMA = """
+CREATE TABLE offerdb (
+    id VARCHAR NOT NULL PRIMARY KEY,
+    shop_name VARCHAR NOT NULL,
+    bank_name VARCHAR NOT NULL,
+    offer_type VARCHAR(8) NOT NULL,
+    description VARCHAR NOT NULL,
+    expiry_date DATETIME
+)
+"""
+
+
+def make_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(health.router)
+    app.include_router(offers.router, prefix="/offers")
+    return app
+
+
+def test_health_is_unavailable_until_warmed_up(database_url: str):
+    app = make_app()
+    client = TestClient(app)
+
+    assert client.get("/health").status_code == 503  # The lifespan only runs within the context manager
+    with client:
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        assert shop_index._index is not None and shop_index._index.keys == ["nike"]
+        assert db_session._async_engine is not None
+        assert db_session._async_engine.pool.checkedin() == settings.db_warmup_connections
+    assert db_session._async_engine is None  # Disposed on shutdown
+    assert client.get("/ping").status_code == 200
+
+
+def test_startup_migrates_a_database_with_the_previous_schema(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    database_url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text(LEGACY_SCHEMA))
+        connection.execute(
+            text("INSERT INTO offerdb VALUES ('nike|chase|5%', 'Nike', 'Chase', 'CASHBACK', '5% back', NULL)")
+        )
+    engine.dispose()
+    monkeypatch.setattr(settings, "database_url", database_url)
+    shop_index.reset_shop_index()
+    search_cache.clear()
+    response_cache.clear()
+
+    with TestClient(make_app()) as client:
+        response = client.get("/offers/search", params={"shops": ["nike"]})
+
+    assert response.status_code == 200
+    assert [offer["shop"]["name"] for offer in response.json()] == ["Nike"]
+    shop_index.reset_shop_index()
+
+
+def test_startup_survives_an_unreachable_database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    folder = tmp_path / "not_mounted_yet"
+    monkeypatch.setattr(settings, "database_url", f"sqlite:///{folder / 'offers.db'}")
+    monkeypatch.setattr(settings, "startup_retry_interval", 0.05)
+    shop_index.reset_shop_index()
+
+    with TestClient(make_app()) as client:
+        assert client.get("/health").status_code == 503
+
+        folder.mkdir()  # The database becomes reachable, the next retry warms up
+        deadline = time.monotonic() + 5
+        while client.get("/health").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert client.get("/health").json() == {"status": "ok"}
+    shop_index.reset_shop_index()
+
+
+def test_pool_options_skip_queue_settings_for_in_memory_sqlite(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "db_pool_size", 3)
+
+    assert get_pool_options("postgresql://user:secret@db/cardwise")["pool_size"] == 3
+    assert "pool_size" not in get_pool_options("sqlite:///:memory:")
+    assert get_pool_options("sqlite:///:memory:")["pool_pre_ping"] is settings.db_pool_pre_ping
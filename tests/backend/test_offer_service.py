@@ -1,51 +1,61 @@
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock
 
-from backend.app.services.offer_service import OfferService
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.app.services.offer_service import OfferService, search_cache
+from backend.app.services.shop_index import reset_shop_index
 from cardwise.domain.models.bank import Bank
 from cardwise.domain.models.offer import Offer, OfferTypeEnum
 from cardwise.domain.models.shop import Shop
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
 from cardwise.persistence.models.offer_db import OfferDB
 
 
+@pytest.fixture(name="session")
+def session_fixture():
+    reset_shop_index()
+    search_cache.clear()
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    reset_shop_index()
+
+
 def make_offer_db(shop_name: str, bank_name: str = "Bank A") -> OfferDB:
     """
-    Create a fake OfferDB object with a realistic .to_domain() implementation.
+    Create an OfferDB row from a realistic domain Offer.
     """
-    shop = Shop(name=shop_name)
-    bank = Bank(name=bank_name)
     offer = Offer(
-        shop=shop,
-        bank=bank,
+        shop=Shop(name=shop_name),
+        bank=Bank(name=bank_name),
         offer_type=OfferTypeEnum.CASHBACK,
         description=f"10% off at {shop_name}",
         expiry_date=datetime.now() + timedelta(days=10),
     )
+    return OfferDB.from_domain(offer)
+
 
-    db = MagicMock(spec=OfferDB)
-    db.shop_name = shop.name
-    db.to_domain.return_value = offer
-    return db
+def add_offers(session: Session, *shop_names: str) -> None:
+    session.add_all([make_offer_db(name) for name in shop_names])
+    session.commit()
 
 
-def test_fuzzy_search_exact_match():
-    mock_session = MagicMock()
-    db_offers = [make_offer_db("Adidas"), make_offer_db("Starbucks")]
-    mock_session.exec.return_value.all.return_value = db_offers
+def test_fuzzy_search_exact_match(session: Session):
+    add_offers(session, "Adidas", "Starbucks")
 
-    service = OfferService(session=mock_session, threshold=75)
+    service = OfferService(session=session, threshold=75)
     results = service.fuzzy_search(["adidas"])
 
     assert len(results) == 1
     assert results[0].shop.name.lower() == "adidas"
 
 
-def test_fuzzy_search_multiple_queries():
-    mock_session = MagicMock()
-    db_offers = [make_offer_db("Adidas"), make_offer_db("Starbucks"), make_offer_db("Adidaz")]
-    mock_session.exec.return_value.all.return_value = db_offers
+def test_fuzzy_search_multiple_queries(session: Session):
+    add_offers(session, "Adidas", "Starbucks", "Adidaz")
 
-    service = OfferService(session=mock_session, threshold=70)
+    service = OfferService(session=session, threshold=70)
     results = service.fuzzy_search(["adidas", "starbucks"])
 
     shop_names = {offer.shop.name.lower() for offer in results}
@@ -53,36 +63,110 @@ def test_fuzzy_search_multiple_queries():
     assert "starbucks" in shop_names
 
 
-def test_fuzzy_search_no_matches():
-    mock_session = MagicMock()
-    db_offers = [make_offer_db("Nike"), make_offer_db("Puma")]
-    mock_session.exec.return_value.all.return_value = db_offers
+def test_fuzzy_search_no_matches(session: Session):
+    add_offers(session, "Nike", "Puma")
 
-    service = OfferService(session=mock_session, threshold=90)
+    service = OfferService(session=session, threshold=90)
     results = service.fuzzy_search(["unknownshop"])
 
     assert results == []
 
 
-def test_list_offers():
-    mock_session = MagicMock()
-    offer_db = make_offer_db("Adidas")
-    mock_session.exec.return_value.all.return_value = [offer_db]
+def test_fuzzy_search_refreshes_index_on_new_generation(session: Session):
+    add_offers(session, "Nike")
+    service = OfferService(session=session, threshold=75)
+    assert service.fuzzy_search(["adidas"]) == []
+
+    # New rows are not visible until an ingestion run bumps the generation
+    add_offers(session, "Adidas")
+    assert service.fuzzy_search(["adidas"]) == []
+
+    session.add(IngestionRunDB(offer_count=2))
+    session.commit()
+    results = service.fuzzy_search(["adidas"])
+    assert [offer.shop.name for offer in results] == ["Adidas"]
 
-    service = OfferService(session=mock_session)
+
+def test_list_offers(session: Session):
+    add_offers(session, "Adidas")
+
+    service = OfferService(session=session)
     offers = service.list_offers()
 
     assert len(offers) == 1
     assert offers[0].shop.name == "Adidas"
 
 
-def test_list_offers_paginated():
-    mock_session = MagicMock()
-    offer_db = make_offer_db("Starbucks")
-    mock_session.exec.return_value.all.return_value = [offer_db]
+def test_list_offers_paginated(session: Session):
+    add_offers(session, "Starbucks")
 
-    service = OfferService(session=mock_session)
+    service = OfferService(session=session)
     offers = service.list_offers_paginated(limit=10, offset=0)
 
     assert len(offers) == 1
     assert offers[0].shop.name == "Starbucks"
+
+
+def test_list_offers_page_with_cursor(session: Session):
+    add_offers(session, "Adidas", "Nike", "Puma", "Starbucks", "Target")
+    service = OfferService(session=session)
+
+    first_page, cursor = service.list_offers_page(limit=2)
+    assert cursor is not None
+    second_page, cursor = service.list_offers_page(limit=2, cursor=cursor)
+    assert cursor is not None
+    last_page, cursor = service.list_offers_page(limit=2, cursor=cursor)
+    assert cursor is None
+
+    pages = [first_page, second_page, last_page]
+    assert [offer.shop.name for page in pages for offer in page] == ["Adidas", "Nike", "Puma", "Starbucks", "Target"]
+    assert first_page + second_page == service.list_offers_paginated(limit=4, offset=0)
+
+
+def test_list_offers_page_rejects_invalid_cursor(session: Session):
+    service = OfferService(session=session)
+
+    with pytest.raises(ValueError):
+        service.list_offers_page(cursor="%%%")
+
+
+def test_iter_offer_batches(session: Session):
+    add_offers(session, "Adidas", "Nike", "Puma", "Starbucks", "Target")
+    service = OfferService(session=session)
+
+    batches = list(service.iter_offer_batches(batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert sorted(offer.shop.name for batch in batches for offer in batch) == sorted(
+        offer.shop.name for offer in service.list_offers()
+    )
+
+
+def test_record_methods_match_domain_methods(session: Session):
+    add_offers(session, "Adidas", "Adidaz", "Nike", "Puma")
+    service = OfferService(session=session, threshold=75)
+
+    assert [record.to_offer() for record in service.list_offer_records()] == service.list_offers()
+    assert [record.to_offer() for record in service.fuzzy_search_records(["adidas"])] == service.fuzzy_search(
+        ["adidas"]
+    )
+    records, cursor = service.list_offer_records_page(limit=2)
+    assert ([record.to_offer() for record in records], cursor) == service.list_offers_page(limit=2)
+
+
+def test_fuzzy_search_caches_matches_per_query(session: Session):
+    add_offers(session, "Adidas", "Nike", "Puma")
+    session.add(IngestionRunDB(offer_count=3))
+    session.commit()
+    service = OfferService(session=session, threshold=75)
+
+    assert [offer.shop.name for offer in service.fuzzy_search(["adidas"])] == ["Adidas"]
+    assert search_cache.stats()["misses"] == 1
+    assert {offer.shop.name for offer in service.fuzzy_search(["Adidas!", "nike"])} == {"Adidas", "Nike"}
+    assert (search_cache.stats()["hits"], search_cache.stats()["misses"]) == (1, 2)
+
+    # A new ingestion generation invalidates the cached matches
+    add_offers(session, "Adidaz")
+    session.add(IngestionRunDB(offer_count=4))
+    session.commit()
+    assert {offer.shop.name for offer in service.fuzzy_search(["adidas"])} == {"Adidas", "Adidaz"}
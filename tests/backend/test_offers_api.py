@@ -0,0 +1,154 @@
+import inspect
+from typing import AsyncIterator, Callable, Dict, List, Union
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.app.api import offers
+from backend.app.api.caching import response_cache
+from backend.app.api.offers import NDJSON_MEDIA_TYPE, NEXT_CURSOR_HEADER
+from backend.app.core.config import settings
+from backend.app.db.session import get_async_session
+from cardwise.domain.models.offer import Offer
+
+SHOP_NAMES = ["Adidas", "Nike", "Puma", "Starbucks", "Target"]
+
+
+def test_all_offers_are_streamed_and_never_cached(client: TestClient, ingest: Callable[..., None]):
+    ingest(*SHOP_NAMES)
+
+    response = client.get("/offers/all")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert sorted(offer["shop"]["name"] for offer in response.json()) == SHOP_NAMES
+    assert "etag" in response.headers
+    assert len(response_cache) == 0
+
+
+def test_responses_carry_the_generation_validators(client: TestClient, ingest: Callable[..., None]):
+    ingest(*SHOP_NAMES)
+
+    response = client.get("/offers/", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"gen-1"'
+    assert response.headers["last-modified"].endswith(" GMT")
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_if_none_match_returns_not_modified(client: TestClient, ingest: Callable[..., None]):
+    ingest(*SHOP_NAMES)
+    etag = client.get("/offers/search", params={"shops": ["nike"]}).headers["etag"]
+
+    response = client.get("/offers/search", params={"shops": ["nike"]}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_cache_hits_return_the_same_body_and_headers(client: TestClient, ingest: Callable[..., None]):
+    ingest(*SHOP_NAMES)
+
+    first = client.get("/offers/", params={"limit": 2})
+    second = client.get("/offers/", params={"limit": 2})
+
+    assert response_cache.stats()["hits"] == 1
+    assert second.content == first.content
+    assert second.headers["x-next-cursor"] == first.headers["x-next-cursor"]
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_a_new_ingestion_run_invalidates_cached_responses(client: TestClient, ingest: Callable[..., None]):
+    ingest("Nike")
+    before = client.get("/offers/search", params={"shops": ["nike"]})
+
+    ingest("Nike", bank_name="Amex")
+    after = client.get("/offers/search", params={"shops": ["nike"]}, headers={"If-None-Match": before.headers["etag"]})
+
+    assert after.status_code == 200
+    assert after.headers["etag"] == '"gen-2"'
+    assert sorted(offer["bank"]["name"] for offer in after.json()) == ["Amex", "Chase"]
+    assert [offer["bank"]["name"] for offer in before.json()] == ["Chase"]
+
+
+def test_pages_are_chained_through_the_next_cursor_header(client: TestClient, ingest: Callable[..., None]):
+    ingest(*SHOP_NAMES)
+
+    names: List[str] = []
+    cursors: List[str] = []
+    params: Dict[str, Union[int, str]] = {"limit": 2}
+    while True:
+        response = client.get("/offers/", params=params)
+        assert response.status_code == 200
+        names += [offer["shop"]["name"] for offer in response.json()]
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        cursors.append(response.headers[NEXT_CURSOR_HEADER])
+        params = {"limit": 2, "cursor": cursors[-1]}
+
+    assert sorted(names) == SHOP_NAMES
+    assert len(cursors) == 2
+
+
+def test_a_bad_cursor_is_rejected(client: TestClient, ingest: Callable[..., None]):
+    ingest(*SHOP_NAMES)
+
+    response = client.get("/offers/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert "cursor" in response.json()["detail"].lower()
+
+
+def test_all_offers_are_streamed_as_ndjson_on_request(
+    client: TestClient, ingest: Callable[..., None], monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(settings, "stream_batch_size", 2)
+    ingest(*SHOP_NAMES)
+
+    array = client.get("/offers/all")
+    ndjson = client.get("/offers/all", params={"stream": True})
+
+    # Several DB batches joined into a single JSON array
+    assert sorted(offer["shop"]["name"] for offer in array.json()) == SHOP_NAMES
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == NDJSON_MEDIA_TYPE
+    lines = ndjson.content.splitlines()
+    assert len(lines) == len(SHOP_NAMES)
+    assert [orjson.loads(line) for line in lines] == array.json()
+
+
+@pytest.mark.parametrize("path", ["/offers/", "/offers/search?shops=nike&shops=puma", "/offers/all"])
+def test_serialized_rows_match_the_offer_response_model(client: TestClient, ingest: Callable[..., None], path: str):
+    ingest(*SHOP_NAMES)
+
+    response = client.get(path)
+
+    offers = TypeAdapter(List[Offer]).validate_json(response.content)
+    assert offers
+    assert [offer.model_dump(mode="json") for offer in offers] == response.json()
+
+
+def test_offer_endpoints_use_the_async_session_dependency(client: TestClient, ingest: Callable[..., None]):
+    ingest(*SHOP_NAMES)
+    sessions: List[AsyncSession] = []
+
+    async def recording_session() -> AsyncIterator[AsyncSession]:
+        async for session in get_async_session():
+            sessions.append(session)
+            yield session
+
+    client.app.dependency_overrides[get_async_session] = recording_session  # type: ignore[attr-defined]
+    for path in ["/offers/", "/offers/search?shops=nike", "/offers/all"]:
+        assert client.get(path).status_code == 200
+
+    assert len(sessions) == 3
+    assert all(isinstance(session, AsyncSession) for session in sessions)
+    # Closed by the dependency once the response is sent
+    assert not any(session.in_transaction() for session in sessions)
+    assert all(inspect.iscoroutinefunction(route.endpoint) for route in offers.router.routes)  # type: ignore[attr-defined]
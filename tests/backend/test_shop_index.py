@@ -0,0 +1,48 @@
+import random
+
+import pytest
+from rapidfuzz import fuzz
+
+from backend.app.services.shop_index import ShopNameIndex, min_shared_ngrams
+from cardwise.domain.utils import normalize_string
+
+SHOP_NAMES = [
+    "Adidas", "Adidaz", "Starbucks", "Star Market", "Shake Shack", "Whole Foods", "Target", "Walmart",
+    "Best Buy", "Home Depot", "Blue Apron", "DoorDash", "Uber Eats", "Spotify", "Netflix", "Chipotle",
+    "Sweetgreen", "Panera Bread", "Nike", "Puma", "AT&T", "H&M", "7-Eleven", "Lululemon", "Lyft",
+]  # fmt: skip
+
+
+@pytest.fixture(name="index")
+def index_fixture() -> ShopNameIndex:
+    return ShopNameIndex(generation=1, offer_ids_by_key={normalize_string(name): [name] for name in SHOP_NAMES})
+
+
+@pytest.mark.parametrize("threshold", [0, 50, 75, 90, 100])
+def test_candidates_never_drop_a_match(index: ShopNameIndex, threshold: int):
+    rng = random.Random(threshold)
+    queries = [normalize_string(name) for name in SHOP_NAMES]
+    # Typos: drop or insert a character, and reverse the whole name
+    for name in list(queries):
+        chars = list(name)
+        i = rng.randrange(len(chars))
+        queries.append("".join(chars[:i] + chars[i + 1 :]))
+        queries.append("".join(chars[:i] + ["x"] + chars[i:]))
+        queries.append(name[::-1])
+
+    for query in queries:
+        expected = {key for key in index.keys if fuzz.ratio(query, key) >= threshold}
+        assert expected <= set(index.candidates(query, threshold)), query
+
+
+def test_candidates_prune_unrelated_names(index: ShopNameIndex):
+    candidates = index.candidates("adidas", 75)
+
+    assert "adidas" in candidates
+    assert "starbucks" not in candidates
+    assert len(candidates) < len(index.keys)
+
+
+def test_min_shared_ngrams_rejects_incompatible_lengths():
+    assert min_shared_ngrams(3, 30, 75) is None
+    assert min_shared_ngrams(6, 6, 100) == 7  # Identical strings share all of their padded bigrams
@@ -0,0 +1,43 @@
+from sqlalchemy import create_engine, inspect, text
+
+from cardwise.persistence.migrations import MIGRATIONS, run_migrations
+
+LEGACY_SCHEMA = """
+CREATE TABLE offerdb (
+    id VARCHAR NOT NULL PRIMARY KEY,
+    shop_name VARCHAR NOT NULL,
+    bank_name VARCHAR NOT NULL,
+    offer_type VARCHAR(8) NOT NULL,
+    description VARCHAR NOT NULL,
+    expiry_date DATETIME
+)
+"""
+
+
+def test_run_migrations_upgrades_a_legacy_database():
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as connection:
+        connection.execute(text(LEGACY_SCHEMA))
+        connection.execute(
+            text("INSERT INTO offerdb VALUES ('shake_shack|chase|5%', 'Shake Shack!', 'Chase', 'CASHBACK', '5%', NULL)")
+        )
+
+    assert run_migrations(engine) == MIGRATIONS[-1].version
+
+    indexed = {tuple(index["column_names"]) for index in inspect(engine).get_indexes("offerdb")}
+    assert {("shop_name",), ("bank_name",), ("expiry_date",), ("shop_key",)} <= indexed
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT shop_key FROM offerdb")).scalar_one() == "shake_shack"
+    # Already applied migrations are not run again
+    assert run_migrations(engine) == MIGRATIONS[-1].version
+
+
+def test_run_migrations_on_a_fresh_database():
+    engine = create_engine("sqlite:///:memory:")
+
+    assert run_migrations(engine) == MIGRATIONS[-1].version
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT version FROM schemaversiondb")).scalars().all() == [
+            migration.version for migration in MIGRATIONS
+        ]
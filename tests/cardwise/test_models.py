@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from cardwise.domain.models import Bank, Offer, OfferRecord, OfferTypeEnum, Shop
+
+
+def make_offer(description: str = "5% cash back") -> Offer:
+    return Offer(
+        shop=Shop.intern("Shake Shack"),
+        bank=Bank.intern("Chase"),
+        offer_type=OfferTypeEnum.CASHBACK,
+        description=description,
+    )
+
+
+def test_ids_are_computed_once(monkeypatch: pytest.MonkeyPatch):
+    calls = []
+    monkeypatch.setattr("cardwise.domain.utils.normalize_string", lambda s: calls.append(s) or s.lower())
+    shop = Shop(name="Adidas")
+
+    assert shop.id == shop.id == "adidas"
+    assert calls == ["Adidas"]
+
+
+def test_intern_returns_shared_instances():
+    assert Shop.intern("Shake Shack") is Shop.intern("Shake Shack")
+    assert Bank.intern("Chase") is Bank.intern("Chase")
+    assert Shop.intern("Shake Shack") == Shop(name="Shake Shack")
+    assert make_offer().shop is make_offer().shop
+
+
+def test_domain_models_are_frozen():
+    offer = make_offer()
+
+    with pytest.raises(ValidationError):
+        offer.description = "10% cash back"  # type: ignore
+
+
+def test_model_copy_recomputes_cached_ids():
+    offer = make_offer()
+    assert offer.id.endswith("|5% cash back")
+
+    assert offer.model_copy(update={"description": "10% cash back"}).id.endswith("|10% cash back")
+    assert offer.model_copy(update={"expiry_date": datetime(2030, 1, 31)}) == offer
+    assert offer.model_dump()["id"] == offer.id
+
+
+@pytest.mark.parametrize("expiry_date", [None, datetime(2030, 1, 31, 23, 59, 59, 123456)])
+def test_offer_record_round_trip(expiry_date):  # type: ignore
+    offer = make_offer().model_copy(update={"expiry_date": expiry_date})
+    record = OfferRecord.from_offer(offer)
+
+    assert record.to_offer() == offer
+    assert record.to_json_dict() == offer.model_dump(mode="json")
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from cardwise.domain.models import Bank, Offer, OfferTypeEnum, Shop
+from cardwise.persistence.models.offer_db import OfferDB
+from cardwise.persistence.sqlite import SQLITE_PRAGMAS, apply_sqlite_pragmas
+
+
+def pragma(connection, name: str):  # type: ignore
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_pragmas_are_applied_on_connect(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'offers.db'}")
+    apply_sqlite_pragmas(engine)
+
+    with engine.connect() as connection:
+        assert pragma(connection, "journal_mode") == "wal"
+        assert pragma(connection, "synchronous") == 1  # NORMAL
+        assert pragma(connection, "busy_timeout") == SQLITE_PRAGMAS["busy_timeout"]
+        assert pragma(connection, "cache_size") == SQLITE_PRAGMAS["cache_size"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_pragmas_are_applied_to_async_engines(tmp_path: Path, anyio_backend: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'offers.db'}")
+    apply_sqlite_pragmas(engine.sync_engine)
+
+    async with engine.connect() as connection:
+        assert (await connection.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("tuned", [True, False])
+def test_readers_are_not_blocked_by_a_write_transaction(tmp_path: Path, tuned: bool):
+    engine = create_engine(f"sqlite:///{tmp_path / 'offers.db'}", connect_args={"timeout": 0})
+    if tuned:
+        apply_sqlite_pragmas(engine, {**SQLITE_PRAGMAS, "busy_timeout": 0})
+    SQLModel.metadata.create_all(engine)
+    offer = Offer(shop=Shop(name="Nike"), bank=Bank(name="Chase"), offer_type=OfferTypeEnum.MISC, description="5%")
+
+    with engine.connect() as writer, Session(engine) as reader:
+        writer.exec_driver_sql("BEGIN EXCLUSIVE")  # As taken by a commit, or a write spilling out of the page cache
+        writer.execute(insert(OfferDB.__table__), [OfferDB.row_from_domain(offer)])  # type: ignore
+        count = select(func.count()).select_from(OfferDB)
+        if tuned:
+            # The reader sees the last committed snapshot instead of waiting for the lock
+            assert reader.exec(count).one() == 0
+        else:
+            with pytest.raises(OperationalError, match="database is locked"):
+                reader.exec(count).one()
+        writer.commit()
+    engine.dispose()
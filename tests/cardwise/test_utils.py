@@ -0,0 +1,54 @@
+import random
+import sys
+
+import pytest
+
+from cardwise.domain.utils import normalize_string
+
+MERCHANTS = [
+    "Adidas",
+    "  Shake Shack ",
+    "Bed Bath & Beyond",
+    "AT&T",
+    "Macy's",
+    "7-Eleven",
+    "Ben & Jerry's",
+    "H&M",
+    "Crème de la Crème",
+    "Café Ñandú",
+    "ΟΔΥΣΣΕΥΣ",
+    "İstanbul Kebab",
+    "Straße",
+    "東京 Sushi",
+    "١٢٣ Market",
+    "snake_case_shop",
+    "tab\tand\nnewline",
+    "",
+    "   ",
+]
+
+
+def reference_normalize_string(s: str) -> str:
+    """
+    The original implementation, that normalize_string must stay equivalent to.
+    """
+    s_ = "".join([c.lower() for c in s if c.isalnum() or c == " "])
+    return s_.strip().replace(" ", "_")
+
+
+def random_names(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    alphabet = [chr(i) for i in range(0x250)] + list("ΣσςİıẞßÆæŒœ東京١٢٣_-'&.!  ")
+    names = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24))) for _ in range(count // 2)]
+    names += ["".join(chr(rng.randint(0, sys.maxunicode)) for _ in range(rng.randint(0, 8))) for _ in range(count // 2)]
+    return names
+
+
+@pytest.mark.parametrize("name", MERCHANTS)
+def test_normalize_string_matches_the_reference(name: str):
+    assert normalize_string(name) == reference_normalize_string(name)
+
+
+def test_normalize_string_matches_the_reference_on_a_large_corpus():
+    for name in random_names(20000):
+        assert normalize_string(name) == reference_normalize_string(name), repr(name)
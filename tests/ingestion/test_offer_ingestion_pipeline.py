@@ -0,0 +1,311 @@
+import os
+import threading
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+import pytest
+from bs4 import BeautifulSoup
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from cardwise.domain.models import Bank, Offer, OfferTypeEnum, Shop
+from cardwise.exceptions import OfferParsingError
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
+from cardwise.persistence.models.offer_db import OfferDB
+from ingestion.core.config import settings
+from ingestion.gcs.storage import LocalHTMLStorage
+from ingestion.parsers.base import BankOfferParser
+from ingestion.persistence.repository import OfferRepository
+from ingestion.pipeline.offer_ingestion_pipeline import (
+    Document,
+    OfferIngestionPipeline,
+    ParserPool,
+    download_document,
+    parse_document,
+)
+from ingestion.pipeline.stages import Stage, run_stages
+
+
+class RecordingStorage(LocalHTMLStorage):
+    """
+    Local storage recording the files downloaded.
+    """
+
+    def __init__(self, root: Path):
+        super().__init__(root)
+        self.downloaded: List[str] = []
+
+    def download_file_content(self, file_path: str) -> str:
+        self.downloaded.append(file_path)
+        return super().download_file_content(file_path)
+
+
+class FlakyStorage(LocalHTMLStorage):
+    """
+    Local storage failing the first `failures` downloads or openings of each file.
+    """
+
+    def __init__(self, root: Path, failures: int):
+        super().__init__(root)
+        self.failures = failures
+        self.attempts: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def _attempt(self, file_path: str) -> None:
+        with self.lock:
+            self.attempts[file_path] = self.attempts.get(file_path, 0) + 1
+            attempt = self.attempts[file_path]
+        if attempt <= self.failures:
+            raise ConnectionError(f"Transient error on {file_path}")
+
+    def download_file_content(self, file_path: str) -> str:
+        self._attempt(file_path)
+        return super().download_file_content(file_path)
+
+    def open_file(self, file_path: str) -> BinaryIO:
+        self._attempt(file_path)
+        return super().open_file(file_path)
+
+
+class ShopListParser(BankOfferParser):
+    """
+    Parses <li> shop names, failing on documents without any.
+    """
+
+    offer_tag = "ul"
+    offer_class = "shops"
+
+    def __init__(self, bank_name: str):
+        super().__init__(bank_name=bank_name, offer_type=OfferTypeEnum.CASHBACK)
+
+    def _extract_offers(self, soup: BeautifulSoup) -> List[Offer]:
+        items = soup.find_all("li")
+        if not items:
+            raise OfferParsingError(self.bank.name, "No shops found")
+        return [
+            Offer(shop=Shop(name=li.get_text(strip=True)), bank=self.bank, offer_type=self.offer_type, description="5%")
+            for li in items
+        ]
+
+
+class WorkerKillingParser(ShopListParser):
+    """
+    Kills the worker process parsing the first document, as when it runs out of memory.
+    """
+
+    def __init__(self, bank_name: str, marker: Path):
+        super().__init__(bank_name)
+        self.marker = marker
+
+    def parse(self, html_doc: str) -> List[Offer]:
+        if not self.marker.exists():
+            self.marker.touch()
+            os._exit(1)
+        return super().parse(html_doc)
+
+
+SHOP_LIST_PAGES = {
+    "bank_a": '<ul class="shops"><li>Adidas</li><li>Nike</li></ul>',
+    "bank_b": "<p>Page layout changed</p>",
+    "bank_c": '<ul class="shops"><li>Puma</li></ul>',
+}
+
+
+def shop_list_documents() -> List[Document]:
+    return [
+        Document(bank_id, f"data/bank_htmls/{bank_id}.html", ShopListParser(bank_id.replace("_", " ").title()))
+        for bank_id in SHOP_LIST_PAGES
+    ]
+
+
+def by_bank(documents: List[Document]) -> Dict[str, Optional[List[str]]]:
+    return {
+        document.bank_id: None if document.offers is None else [offer.shop.name for offer in document.offers]
+        for document in documents
+    }
+
+
+def chase_page(*shop_names: str) -> str:
+    tiles = "".join(f'<div class="r9jbije r9jbijl"><span>{s}</span><span>5% cash back</span></div>' for s in shop_names)
+    return f"<html><body>{tiles}</body></html>"
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def run_pipeline(session: Session, storage: RecordingStorage, force: bool = False) -> List[str]:
+    pipeline = OfferIngestionPipeline(Path("unused"), OfferRepository(session), storage=storage, force=force)
+    pipeline.run()
+    return sorted(session.exec(select(OfferDB.shop_name)).all())
+
+
+def test_pipeline_skips_unchanged_documents(session: Session, tmp_path: Path):
+    folder = tmp_path / "data" / "bank_htmls"
+    folder.mkdir(parents=True)
+    (folder / "chase.html").write_text(chase_page("Adidas", "Nike"))
+    storage = RecordingStorage(tmp_path)
+
+    assert run_pipeline(session, storage) == ["Adidas", "Nike"]
+    assert storage.downloaded == ["data/bank_htmls/chase.html"]
+    generation = session.exec(select(IngestionRunDB.id)).all()
+
+    # Unchanged: neither downloaded nor parsed, and the stored offers are kept
+    assert run_pipeline(session, storage) == ["Adidas", "Nike"]
+    assert storage.downloaded == ["data/bank_htmls/chase.html"]
+    assert session.exec(select(IngestionRunDB.id)).all() == generation
+
+    (folder / "chase.html").write_text(chase_page("Adidas", "Puma"))
+    assert run_pipeline(session, storage) == ["Adidas", "Puma"]
+    assert len(storage.downloaded) == 2
+
+    assert run_pipeline(session, storage, force=True) == ["Adidas", "Puma"]
+    assert len(storage.downloaded) == 3
+
+
+def test_pipeline_syncs_each_bank_and_keeps_failed_ones(session: Session, tmp_path: Path):
+    folder = tmp_path / "data" / "bank_htmls"
+    folder.mkdir(parents=True)
+    (folder / "chase.html").write_text(chase_page("Adidas", "Nike"))
+    (folder / "bank_of_america.html").write_text(chase_page("Puma"))  # Not a Bank of America page
+    stale = Offer(
+        shop=Shop(name="Gap"), bank=Bank(name="Capital One"), offer_type=OfferTypeEnum.POINTS, description="2x"
+    )
+    kept = Offer(
+        shop=Shop(name="Zara"), bank=Bank(name="Bank of America"), offer_type=OfferTypeEnum.CASHBACK, description="3%"
+    )
+    OfferRepository(session).sync([stale, kept])
+
+    stats = OfferIngestionPipeline(Path("unused"), OfferRepository(session), storage=RecordingStorage(tmp_path)).run()
+
+    # Chase is synced, Bank of America fails to parse and keeps its offers, Capital One has no document anymore
+    assert (stats.inserted, stats.deleted) == (2, 1)
+    assert run_pipeline(session, RecordingStorage(tmp_path)) == ["Adidas", "Nike", "Zara"]
+    assert len(session.exec(select(IngestionRunDB.id)).all()) == 2
+
+
+def test_pipeline_publishes_nothing_when_the_writer_fails(
+    session: Session, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    folder = tmp_path / "data" / "bank_htmls"
+    folder.mkdir(parents=True)
+    (folder / "chase.html").write_text(chase_page("Adidas", "Nike"))
+    stale = Offer(shop=Shop(name="Gap"), bank=Bank(name="Chase"), offer_type=OfferTypeEnum.POINTS, description="2x")
+    repository = OfferRepository(session)
+    repository.sync([stale])
+
+    def fail(bank_ids: List[str]) -> int:
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(repository, "delete_banks_except", fail)
+    with pytest.raises(RuntimeError):
+        OfferIngestionPipeline(Path("unused"), repository, storage=RecordingStorage(tmp_path)).run()
+
+    # Chase was applied before the failure, but is rolled back with the rest of the run
+    assert session.exec(select(OfferDB.shop_name)).all() == ["Gap"]
+    assert len(session.exec(select(IngestionRunDB.id)).all()) == 1
+    assert repository.get_document_hashes() == {}
+
+
+@pytest.mark.parametrize("parse_workers", [1, 2])
+def test_parse_stage_isolates_failing_documents(parse_workers: int):
+    documents = [document._replace(html_doc=SHOP_LIST_PAGES[document.bank_id]) for document in shop_list_documents()]
+
+    with ExitStack() as stack:
+        pool = stack.enter_context(ParserPool(parse_workers)) if parse_workers > 1 else None
+        stage = Stage("parse", partial(parse_document, pool=pool), workers=parse_workers)
+        parsed = list(run_stages(documents, [stage], queue_size=2))
+
+    assert by_bank(parsed) == {"bank_a": ["Adidas", "Nike"], "bank_b": None, "bank_c": ["Puma"]}
+    assert [type(document.error) for document in parsed if document.error] == [OfferParsingError]
+    assert all(document.html_doc is None for document in parsed)
+
+
+def test_stream_parse_stage_isolates_failing_documents(tmp_path: Path):
+    folder = tmp_path / "data" / "bank_htmls"
+    folder.mkdir(parents=True)
+    for bank_id, page in SHOP_LIST_PAGES.items():
+        (folder / f"{bank_id}.html").write_text(page)
+    stage = Stage("parse", partial(parse_document, stream_from=LocalHTMLStorage(tmp_path)), workers=2)
+
+    parsed = list(run_stages(shop_list_documents(), [stage], queue_size=2))
+
+    assert by_bank(parsed) == {"bank_a": ["Adidas", "Nike"], "bank_b": None, "bank_c": ["Puma"]}
+    assert [type(document.error) for document in parsed if document.error] == [OfferParsingError]
+
+
+@pytest.mark.parametrize("failures, succeeded", [(2, True), (3, False)])
+def test_download_stage_retries_transient_failures(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, failures: int, succeeded: bool
+):
+    monkeypatch.setattr(settings, "download_max_retries", 2)
+    monkeypatch.setattr(settings, "download_retry_backoff", 0)
+    folder = tmp_path / "data" / "bank_htmls"
+    folder.mkdir(parents=True)
+    for bank_id, page in SHOP_LIST_PAGES.items():
+        (folder / f"{bank_id}.html").write_text(page)
+    storage = FlakyStorage(tmp_path, failures=failures)
+
+    stage = Stage("download", partial(download_document, storage), workers=2)
+
+    downloaded = list(run_stages(shop_list_documents(), [stage], queue_size=2))
+
+    assert set(storage.attempts.values()) == {3}
+    if succeeded:
+        assert {document.bank_id: document.html_doc for document in downloaded} == SHOP_LIST_PAGES
+    else:
+        assert all(isinstance(document.error, ConnectionError) for document in downloaded)
+
+
+def test_parser_pool_survives_a_dying_worker(tmp_path: Path):
+    parser = WorkerKillingParser("Bank A", tmp_path / "killed")
+
+    with ParserPool(max_workers=2) as pool:
+        offers = pool.parse(parser, SHOP_LIST_PAGES["bank_a"])
+        assert [offer.shop.name for offer in pool.parse(ShopListParser("Bank C"), SHOP_LIST_PAGES["bank_c"])] == [
+            "Puma"
+        ]
+
+    assert (tmp_path / "killed").exists()
+    assert [offer.shop.name for offer in offers] == ["Adidas", "Nike"]
+
+
+@pytest.mark.parametrize("failures, succeeded", [(2, True), (3, False)])
+def test_stream_parse_stage_retries_opening_the_documents(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, failures: int, succeeded: bool
+):
+    monkeypatch.setattr(settings, "download_max_retries", 2)
+    monkeypatch.setattr(settings, "download_retry_backoff", 0)
+    folder = tmp_path / "data" / "bank_htmls"
+    folder.mkdir(parents=True)
+    (folder / "bank_a.html").write_text(SHOP_LIST_PAGES["bank_a"])
+    storage = FlakyStorage(tmp_path, failures=failures)
+
+    document = parse_document(shop_list_documents()[0], stream_from=storage)
+
+    assert storage.attempts == {"data/bank_htmls/bank_a.html": 3}
+    if succeeded:
+        assert by_bank([document]) == {"bank_a": ["Adidas", "Nike"]}
+    else:
+        assert isinstance(document.error, ConnectionError)
+
+
+def test_pipeline_ingests_a_document_uploaded_again(session: Session, tmp_path: Path):
+    folder = tmp_path / "data" / "bank_htmls"
+    folder.mkdir(parents=True)
+    page = chase_page("Adidas", "Nike")
+    (folder / "chase.html").write_text(page)
+    storage = RecordingStorage(tmp_path)
+    assert run_pipeline(session, storage) == ["Adidas", "Nike"]
+
+    (folder / "chase.html").unlink()
+    assert run_pipeline(session, storage) == []
+
+    # Unchanged since its last ingestion, but its offers were deleted in between
+    (folder / "chase.html").write_text(page)
+    assert run_pipeline(session, storage) == ["Adidas", "Nike"]
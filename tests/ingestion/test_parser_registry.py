@@ -0,0 +1,103 @@
+import importlib
+import inspect
+import pkgutil
+import sys
+from importlib.metadata import EntryPoint
+from typing import Iterator, List
+
+import pytest
+from bs4 import BeautifulSoup
+
+import ingestion.parsers
+from cardwise.domain.models import Offer, OfferTypeEnum
+from ingestion import parser_registry
+from ingestion.parser_registry import (
+    BUILTIN_PARSERS,
+    ENTRY_POINT_GROUP,
+    discover_parsers,
+    get_parser,
+    register_parser,
+    registered_bank_ids,
+    reset_parser_registry,
+)
+from ingestion.parsers.base import BankOfferParser
+from ingestion.parsers.chase import ChaseOfferParser
+
+
+class AcmeOfferParser(BankOfferParser):
+    def __init__(self):
+        super().__init__(bank_name="Acme Bank", offer_type=OfferTypeEnum.MISC)
+
+    def _extract_offers(self, soup: BeautifulSoup) -> List[Offer]:
+        return []
+
+
+@pytest.fixture(autouse=True)
+def clean_registry() -> Iterator[None]:
+    reset_parser_registry()
+    yield
+    reset_parser_registry()
+
+
+def test_get_parser_loads_each_parser_once():
+    parser = get_parser("chase")
+
+    assert isinstance(parser, ChaseOfferParser)
+    assert get_parser("chase") is parser
+    assert get_parser("unknown_bank") is None
+
+
+def test_discover_parsers_returns_the_builtin_parsers():
+    assert [parser.bank.id for parser in discover_parsers()] == ["bank_of_america", "capital_one", "chase"]
+
+
+def test_get_parser_only_imports_the_module_of_the_bank(monkeypatch: pytest.MonkeyPatch):
+    modules = {bank_id: path.partition(":")[0] for bank_id, path in BUILTIN_PARSERS.items()}
+    for module in modules.values():
+        monkeypatch.delitem(sys.modules, module, raising=False)
+        monkeypatch.delattr(ingestion.parsers, module.rpartition(".")[2], raising=False)
+
+    assert "chase" in registered_bank_ids()
+    assert not any(module in sys.modules for module in modules.values())
+
+    get_parser("chase")
+
+    assert modules.pop("chase") in sys.modules
+    assert not any(module in sys.modules for module in modules.values())
+
+
+def test_every_builtin_parser_is_registered_under_its_bank_id():
+    parser_classes = {
+        parser_class
+        for module_info in pkgutil.iter_modules(ingestion.parsers.__path__, f"{ingestion.parsers.__name__}.")
+        for _, parser_class in inspect.getmembers(importlib.import_module(module_info.name), inspect.isclass)
+        if issubclass(parser_class, BankOfferParser) and not inspect.isabstract(parser_class)
+    }
+
+    assert parser_classes
+    assert {
+        parser_class().bank.id: f"{parser_class.__module__}:{parser_class.__name__}" for parser_class in parser_classes
+    } == BUILTIN_PARSERS
+
+
+def test_explicit_registration_takes_precedence(monkeypatch: pytest.MonkeyPatch):
+    entry_point = EntryPoint(name="acme_bank", value="not_a_module:AcmeOfferParser", group=ENTRY_POINT_GROUP)
+    monkeypatch.setattr(parser_registry, "entry_points", lambda group: [entry_point])
+    register_parser("acme_bank", AcmeOfferParser)
+
+    assert isinstance(get_parser("acme_bank"), AcmeOfferParser)
+
+
+def test_entry_points_are_loaded_by_bank_id(monkeypatch: pytest.MonkeyPatch):
+    entry_point = EntryPoint(name="acme_bank", value=f"{__name__}:AcmeOfferParser", group=ENTRY_POINT_GROUP)
+    monkeypatch.setattr(parser_registry, "entry_points", lambda group: [entry_point])
+
+    assert registered_bank_ids() == ["acme_bank", "bank_of_america", "capital_one", "chase"]
+    assert isinstance(get_parser("acme_bank"), AcmeOfferParser)
+
+
+def test_a_parser_registered_for_another_bank_is_rejected():
+    register_parser("chase", AcmeOfferParser)
+
+    with pytest.raises(ValueError, match="registered for 'chase'"):
+        get_parser("chase")
@@ -0,0 +1,115 @@
+import io
+from typing import List, Tuple
+
+import pytest
+
+from cardwise.exceptions import OfferParsingError
+from ingestion.parsers.bank_of_america import BankOfAmericaOfferParser
+from ingestion.parsers.base import PARSER_BACKENDS, BankOfferParser
+from ingestion.parsers.capital_one import CapitalOneOfferParser
+from ingestion.parsers.chase import ChaseOfferParser
+
+OFFERS = [("Adidas", "10% cash back"), ("Shake Shack", "5% cash back"), ("Target", "3% cash back")]
+NOISE = '<div class="r9jbije"><span>Not an offer</span></div><p class="deal-logo-wrapper">Nope</p>'
+
+
+def chase_page(offers: List[Tuple[str, str]]) -> str:
+    tiles = "".join(f'<div class="r9jbije r9jbijl"><span>{s}</span><span>{d}</span></div>' for s, d in offers)
+    return f"<html><body>{NOISE}<section>{tiles}</section></body></html>"
+
+
+def bank_of_america_page(offers: List[Tuple[str, str]]) -> str:
+    tiles = "".join(
+        f'<div class="deal-logo-wrapper top"><img alt="{s} Logo"><span class="deal-offer-percent">{d}</span></div>'
+        for s, d in offers
+    )
+    return f"<html><body>{NOISE}<ul><li>{tiles}</li></ul></body></html>"
+
+
+def capital_one_page(offers: List[Tuple[str, str]]) -> str:
+    tiles = "".join(
+        '<div class="standard-tile relative flex flex-col justify-between w-full h-full mt-0">'
+        f'<img src="https://images.example.com/logo?domain={s.lower().replace(" ", "")}.com">'
+        f"<div>{s}</div><div>{d}</div></div>"
+        for s, d in offers
+    )
+    return f"<html><body>{NOISE}{tiles}</body></html>"
+
+
+CASES = [
+    (ChaseOfferParser, chase_page, ["Adidas", "Shake Shack", "Target"]),
+    (BankOfAmericaOfferParser, bank_of_america_page, ["Adidas", "Shake Shack", "Target"]),
+    (CapitalOneOfferParser, capital_one_page, ["adidas", "shakeshack", "target"]),
+]
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("parser_cls, make_page, shop_names", CASES)
+def test_parsers_extract_offers_with_every_backend(parser_cls, make_page, shop_names, backend: str):  # type: ignore
+    parser: BankOfferParser = parser_cls()
+    parser.backend = backend
+
+    offers = parser.parse(make_page(OFFERS))
+
+    assert sorted((offer.shop.name, offer.description) for offer in offers) == [
+        (shop_name, description) for shop_name, (_, description) in zip(shop_names, OFFERS)
+    ]
+    assert {offer.bank for offer in offers} == {parser.bank}
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+def test_parser_raises_when_no_offer_is_found(backend: str):
+    parser = ChaseOfferParser()
+    parser.backend = backend
+
+    with pytest.raises(OfferParsingError):
+        parser.parse(f"<html><body>{NOISE}</body></html>")
+
+
+def test_parser_rejects_unknown_backend():
+    parser = ChaseOfferParser()
+    parser.backend = "regex"
+
+    with pytest.raises(ValueError):
+        parser.parse(chase_page(OFFERS))
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+def test_parser_only_builds_the_offer_subtrees(backend: str):
+    parser = BankOfAmericaOfferParser()
+    parser.backend = backend
+
+    soup = parser._make_soup(bank_of_america_page(OFFERS))  # type: ignore
+
+    assert soup.find("p") is None and soup.find("body") is None
+    assert len(soup.find_all("img")) == len(OFFERS)
+
+
+@pytest.mark.parametrize("parser_cls, make_page, shop_names", CASES)
+def test_iter_parse_streams_the_same_offers_as_parse(parser_cls, make_page, shop_names):  # type: ignore
+    parser: BankOfferParser = parser_cls()
+    page = make_page(OFFERS * 2)  # Duplicated tiles are yielded once, like parse() does
+
+    streamed = list(parser.iter_parse(io.BytesIO(page.encode()), chunk_size=16))
+
+    assert sorted(streamed, key=lambda offer: offer.id) == sorted(parser.parse(page), key=lambda offer: offer.id)
+    assert sorted(offer.shop.name for offer in streamed) == shop_names
+
+
+@pytest.mark.parametrize("parser_cls, make_page, shop_names", CASES)
+def test_iter_parse_decodes_pages_without_charset_as_utf8(parser_cls, make_page, shop_names):  # type: ignore
+    parser: BankOfferParser = parser_cls()
+    page = make_page([("Café Crème", "5% cash back"), ("Ñandú Señor", "2% cash back")])
+    assert "charset" not in page
+
+    streamed = list(parser.iter_parse(io.BytesIO(page.encode("utf-8")), chunk_size=7))
+
+    assert sorted(streamed, key=lambda offer: offer.id) == sorted(parser.parse(page), key=lambda offer: offer.id)
+    assert not any("Ã" in offer.shop.name for offer in streamed)
+
+
+def test_iter_parse_raises_when_no_offer_is_found():
+    parser = ChaseOfferParser()
+
+    with pytest.raises(OfferParsingError):
+        list(parser.iter_parse(io.BytesIO(f"<html><body>{NOISE}</body></html>".encode())))
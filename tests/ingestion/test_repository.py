@@ -1,11 +1,18 @@
+import csv
+import io
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+
 import pytest
 from sqlmodel import Session, SQLModel, create_engine, select
 
 from cardwise.domain.models.bank import Bank
 from cardwise.domain.models.offer import Offer, OfferTypeEnum
 from cardwise.domain.models.shop import Shop
+from cardwise.persistence.models.ingestion_run_db import IngestionRunDB
 from cardwise.persistence.models.offer_db import OfferDB
-from ingestion.persistence.repository import OfferRepository
+from ingestion.persistence.repository import COPY_NULL, OFFER_TABLE, OfferRepository, SyncStats, _copy_line
 
 
 @pytest.fixture(name="session")
@@ -46,3 +53,147 @@ def test_insert_and_delete_offers(session: Session, sample_offers: list[Offer]):
     repo.delete_all()
     result = session.exec(select(OfferDB)).all()
     assert result == []
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_insert_many_round_trips_all_columns(session: Session, sample_offers: list[Offer], bulk: bool):
+    expiring = sample_offers[0].model_copy(update={"expiry_date": datetime(2030, 1, 31)})
+    offers = [expiring, sample_offers[1]]
+    repo = OfferRepository(session, bulk=bulk, chunk_size=1)
+
+    repo.insert_many(offers)
+
+    stored = session.exec(select(OfferDB).order_by(OfferDB.id)).all()
+    assert [row.to_domain() for row in stored] == sorted(offers, key=lambda offer: offer.id)
+    assert {row.id: row.expiry_date for row in stored} == {offer.id: offer.expiry_date for offer in offers}
+
+
+def test_sync_inserts_updates_and_deletes(session: Session, sample_offers: list[Offer]):
+    repo = OfferRepository(session)
+    first = repo.sync(sample_offers)
+    assert (first.inserted, first.updated, first.deleted) == (2, 0, 0)
+
+    walmart, target = sample_offers
+    costco = Offer(
+        shop=Shop(name="Costco"), bank=Bank(name="Chase"), offer_type=OfferTypeEnum.CASHBACK, description="3%"
+    )
+    walmart_extended = walmart.model_copy(update={"expiry_date": datetime(2030, 1, 31)})
+    second = repo.sync([walmart_extended, costco])
+
+    assert (second.inserted, second.updated, second.deleted, second.unchanged) == (1, 1, 1, 0)
+    stored = {row.id: row for row in session.exec(select(OfferDB)).all()}
+    assert set(stored) == {walmart.id, costco.id}
+    assert stored[walmart.id].expiry_date == datetime(2030, 1, 31)
+    assert target.id not in stored
+
+
+def test_sync_records_a_run_only_when_something_changed(session: Session, sample_offers: list[Offer]):
+    repo = OfferRepository(session)
+
+    repo.sync(sample_offers)
+    unchanged = repo.sync(sample_offers)
+
+    assert not unchanged.changed
+    assert len(session.exec(select(IngestionRunDB)).all()) == 1
+
+
+def test_sync_bank_only_touches_its_bank_until_finished(session: Session, sample_offers: list[Offer]):
+    repo = OfferRepository(session)
+    amex = Offer(shop=Shop(name="Costco"), bank=Bank(name="Amex"), offer_type=OfferTypeEnum.POINTS, description="2x")
+    repo.sync([*sample_offers, amex])
+
+    stats = repo.sync_bank(Bank(name="Chase"), sample_offers[:1])
+    assert (stats.inserted, stats.deleted, stats.unchanged) == (0, 1, 1)
+    assert len(session.exec(select(IngestionRunDB)).all()) == 1  # No run recorded yet
+
+    stats.deleted += repo.delete_banks_except(["chase"])
+    run = repo.finish_sync(stats, {"chase": "abc"})
+
+    assert stats.deleted == 2
+    assert run is not None and run.offer_count == 1
+    assert session.exec(select(OfferDB.id)).all() == [sample_offers[0].id]
+    assert repo.get_document_hashes() == {"chase": "abc"}
+    assert repo.finish_sync(SyncStats()) is None
+
+
+def test_banks_are_synced_in_a_single_transaction(session: Session, sample_offers: list[Offer]):
+    repo = OfferRepository(session)
+    amex = Offer(shop=Shop(name="Costco"), bank=Bank(name="Amex"), offer_type=OfferTypeEnum.POINTS, description="2x")
+    repo.sync([*sample_offers, amex])
+
+    repo.sync_bank(Bank(name="Chase"), [])
+    repo.delete_banks_except(["chase"])
+    session.rollback()
+
+    # Nothing was committed before finish_sync
+    assert len(session.exec(select(OfferDB)).all()) == 3
+
+
+def test_sync_bank_updates_the_offers_of_a_renamed_bank(session: Session):
+    repo = OfferRepository(session)
+    old_name = Offer(
+        shop=Shop(name="Gap"), bank=Bank(name="Capital One"), offer_type=OfferTypeEnum.POINTS, description="2x"
+    )
+    repo.sync([old_name])
+
+    renamed = Offer(
+        shop=Shop(name="Gap"), bank=Bank(name="Capital One®"), offer_type=OfferTypeEnum.POINTS, description="2x"
+    )
+    assert renamed.id == old_name.id
+    stats = repo.sync_bank(renamed.bank, [renamed])
+    repo.finish_sync(stats)
+
+    assert (stats.inserted, stats.updated, stats.deleted) == (0, 1, 0)
+    assert session.exec(select(OfferDB.bank_name)).all() == ["Capital One®"]
+
+
+class RecordingCursor:
+    """
+    psycopg2 cursor recording the COPY statements and their CSV data.
+    """
+
+    def __init__(self):
+        self.copies: List[Tuple[str, str]] = []
+
+    def __enter__(self) -> "RecordingCursor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def copy_expert(self, sql: str, file: io.StringIO) -> None:
+        self.copies.append((sql, file.read()))
+
+
+def test_copy_line_quotes_every_value_but_null():
+    values = [None, OfferTypeEnum.CASHBACK, datetime(2030, 1, 31, 12), "a,b", "x\ny", COPY_NULL, 'say "hi"', ""]
+
+    line = _copy_line(values)
+
+    assert line == '\\N,"CASHBACK","2030-01-31T12:00:00","a,b","x\ny","\\N","say ""hi""",""\n'
+    # Only NULL is unquoted: PostgreSQL reads a quoted "\N" back as the string
+    assert line.count(COPY_NULL) == 2 and f'"{COPY_NULL}"' in line
+    assert next(csv.reader(io.StringIO(line))) == ["\\N", "CASHBACK", "2030-01-31T12:00:00", *values[3:]]
+
+
+def test_copy_writes_enums_as_stored_by_the_offer_table():
+    assert OFFER_TABLE.c.offer_type.type.enums == [member.name for member in OfferTypeEnum]
+
+
+def test_bulk_insert_copies_chunks_on_postgresql(
+    session: Session, sample_offers: list[Offer], monkeypatch: pytest.MonkeyPatch
+):
+    cursor = RecordingCursor()
+    connection = SimpleNamespace(connection=SimpleNamespace(cursor=lambda: cursor))
+    monkeypatch.setattr(session, "get_bind", lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    monkeypatch.setattr(session, "connection", lambda: connection)
+    repo = OfferRepository(session, chunk_size=1)
+
+    repo._bulk_insert([OfferDB.row_from_domain(offer) for offer in sample_offers])
+
+    assert len(cursor.copies) == 2
+    sql, data = cursor.copies[0]
+    assert sql.startswith("COPY offerdb (id, shop_name, bank_name, offer_type, description, expiry_date, shop_key)")
+    assert "FORMAT csv" in sql and f"NULL '{COPY_NULL}'" in sql
+    assert data == _copy_line(OfferDB.row_from_domain(sample_offers[0]).values())
+    assert data.endswith(f',{COPY_NULL},"walmart"\n')
@@ -0,0 +1,50 @@
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from ingestion.pipeline.stages import Stage, run_stages
+
+
+def test_run_stages_chains_the_stages():
+    stages = [Stage("double", lambda x: 2 * x, workers=3), Stage("increment", lambda x: x + 1, workers=2)]
+
+    assert sorted(run_stages(range(100), stages, queue_size=2)) == [2 * x + 1 for x in range(100)]
+
+
+def test_run_stages_applies_backpressure():
+    produced: List[int] = []
+    lock = threading.Lock()
+
+    def produce(item: int) -> int:
+        with lock:
+            produced.append(item)
+        return item
+
+    outputs = run_stages(range(100), [Stage("produce", produce, workers=2)], queue_size=2)
+    assert next(outputs) == 0
+    time.sleep(0.2)
+
+    # The consumer stopped after the first output: the stage blocked once its queue got full
+    assert len(produced) <= 1 + 2 + 2  # Consumed, queued, and held by the blocked workers
+    outputs.close()
+
+
+def test_run_stages_reraises_the_first_stage_failure():
+    def fail_on_three(item: int) -> int:
+        if item == 3:
+            raise ValueError("three")
+        return item
+
+    with pytest.raises(ValueError, match="three"):
+        list(run_stages(range(10), [Stage("fail", fail_on_three, workers=2)], queue_size=1))
+
+
+def test_run_stages_reraises_a_failure_of_the_items():
+    def items() -> Iterator[int]:
+        yield 1
+        raise OSError("listing failed")
+
+    with pytest.raises(OSError, match="listing failed"):
+        list(run_stages(items(), [Stage("identity", lambda x: x, workers=2)], queue_size=1))